@@ -1,10 +1,15 @@
 # battle.py – tout en haut
 import pygame, random, math
-from moviepy import VideoFileClip, ImageSequenceClip, AudioFileClip, CompositeAudioClip
+import bisect
+import itertools
+import functools
+from moviepy import VideoFileClip
+from moviepy.config import FFMPEG_BINARY
+from moviepy.tools import subprocess_call
+from moviepy.video.io.ffmpeg_writer import FFMPEG_VideoWriter
 from pathlib import Path
 from ruamel.yaml import YAML
 import numpy as np
-import pymunk
 import argparse
 import sys
 import io
@@ -17,8 +22,9 @@ from engine.physics import (
     make_space, register_orb_collisions, register_saw_hits,
     register_pickup_handler, active_saws, register_orb_wall_collisions
 )
-from engine.renderer import draw_top_hp_bar, surface_to_array, Camera
+from engine.renderer import draw_top_hp_bars, Camera
 from engine.effects import ParticleEmitter
+from engine.predict import predict_orb_future_path_point
 
 # --- Layout 1080 × 1920 ---
 CANVAS_W, CANVAS_H = 1080, 1920
@@ -58,6 +64,7 @@ PICKUP_KINDS_WEIGHTS = {
     "bomb": 2       # Slightly increased but still controlled (from 0.5 to 2)
 }
 # No separate LOW_HEALTH_THRESHOLD for general spawning, but safety period gives hearts priority.
+_NEG_INF = float('-inf') # "Never spawned" default for item_spawn_cooldowns lookups
 
 # Constants from engine.game_objects that might be needed for prediction
 # This isn't ideal, better to pass them or have them in a shared config.
@@ -68,6 +75,118 @@ def load_cfg(path):
     yaml = YAML(typ="safe")
     return yaml.load(path.read_text())
 
+def build_background_surfaces():
+    """Build the static cyberpunk gradient and the grid overlay drawn on top of it each frame"""
+    # Create a dark gradient from top to bottom for neon aesthetic: one RGB pixel per scanline
+    # in a 1-pixel-wide strip, then let SDL stretch it across the canvas
+    progress = np.arange(CANVAS_H) / CANVAS_H
+    row_colors = np.empty((1, CANVAS_H, 3), dtype=np.uint8)
+    row_colors[0, :, 0] = 20 + progress * 40   # 20 to 60
+    row_colors[0, :, 1] = 25 + progress * 35   # 25 to 60
+    row_colors[0, :, 2] = 80 + progress * 60   # 80 to 140 (dark blue to purple)
+    gradient_strip = pygame.surfarray.make_surface(row_colors)
+    gradient_surface = pygame.transform.scale(gradient_strip, (CANVAS_W, CANVAS_H))
+    
+    # Subtle grid pattern for cyberpunk effect, drawn opaque; the pulse is applied with set_alpha
+    grid_surface = pygame.Surface((CANVAS_W, CANVAS_H), pygame.SRCALPHA)
+    grid_color = (0, 150, 200, 255)
+    for x in range(0, CANVAS_W, 80):  # Vertical grid lines
+        grid_surface.fill(grid_color, (x, 0, 2, CANVAS_H))
+    for y in range(0, CANVAS_H, 80):  # Horizontal grid lines
+        grid_surface.fill(grid_color, (0, y, CANVAS_W, 2))
+    
+    return gradient_surface, grid_surface
+
+_logo_cache = {}  # (logo_path, size) -> scaled logo surface
+
+def load_scaled_logo(logo_path, size):
+    """Load a logo scaled to size, reusing the surface for repeated (path, size) pairs"""
+    key = (logo_path, size)
+    logo = _logo_cache.get(key)
+    if logo is None:
+        # convert_alpha before scaling so the scaled copy is already in display format
+        logo = pygame.transform.smoothscale(pygame.image.load(logo_path).convert_alpha(), size)
+        _logo_cache[key] = logo
+    return logo
+
+_font_cache = {}  # font_size -> pygame default font of that size
+
+def get_font(font_size):
+    """pygame's bundled default font at font_size, created once per size.
+
+    Font(None, ...) loads the bundled font directly; SysFont(None, ...) ends up with the
+    same font but scans the installed system fonts first.
+    """
+    font = _font_cache.get(font_size)
+    if font is None:
+        font = pygame.font.Font(None, font_size)
+        _font_cache[font_size] = font
+    return font
+
+@functools.lru_cache(maxsize=64)
+def render_overlay_text(text, font_size, color):
+    """Rendered overlay text; repeated (text, size, color) overlays share one surface"""
+    return get_font(font_size).render(text, True, color).convert_alpha()
+
+_victory_logo_cache = {}  # (logo surface, size) -> smoothscaled copy for the victory pulse
+
+def scale_victory_logo(logo_surface, size):
+    """Smoothscale the winner's logo to size x size; the pulse only cycles through ~100 sizes"""
+    key = (logo_surface, size)
+    scaled = _victory_logo_cache.get(key)
+    if scaled is None:
+        scaled = pygame.transform.smoothscale(logo_surface, (size, size))
+        _victory_logo_cache[key] = scaled
+    return scaled
+
+_glow_cache = {}  # (width, height, border_color, border_thickness) -> [(thickness, glow surface), ...]
+_GLOW_CACHE_MAX = 8  # arena shrinks over time, so only keep a handful of recent sizes
+
+def get_border_glow_layers(width, height, border_color, border_thickness):
+    """Return the three neon glow layers for the arena border, built once per size/color"""
+    key = (width, height, tuple(border_color), border_thickness)
+    layers = _glow_cache.get(key)
+    if layers is None:
+        if len(_glow_cache) >= _GLOW_CACHE_MAX:
+            _glow_cache.clear()
+        layers = []
+        for thickness, alpha in ((border_thickness + 20, 30),   # Outermost glow
+                                 (border_thickness + 12, 60),   # Middle glow
+                                 (border_thickness + 6, 100)):  # Inner glow
+            glow_surface = pygame.Surface((width + thickness*2, height + thickness*2), pygame.SRCALPHA)
+            glow_rect_surface = pygame.Rect(thickness, thickness, width, height)
+            pygame.draw.rect(glow_surface, (*border_color, alpha), glow_rect_surface, width=thickness)
+            layers.append((thickness, glow_surface))
+        _glow_cache[key] = layers
+    return layers
+
+def mux_audio_into_video(video_path, audio_path, output_path, duration):
+    """Copy the encoded video stream and add the WAV track as AAC, cut to the video duration"""
+    cmd = [
+        FFMPEG_BINARY, "-y",
+        "-i", Path(video_path).as_posix(),
+        "-i", Path(audio_path).as_posix(),
+        "-map", "0:v:0", "-map", "1:a:0",
+        "-c:v", "copy",
+        "-c:a", "aac", "-b:a", "192k", "-ar", "44100",  # Higher bitrate for better quality
+        "-t", f"{duration:.3f}",
+        Path(output_path).as_posix(),
+    ]
+    subprocess_call(cmd, logger=None)
+
+_cached_weights_tuple = None
+_cum_weights = []
+
+def weighted_choice(kinds, weights):
+    """Pick one of kinds by weight, same draw as random.choices but with cached running totals"""
+    global _cached_weights_tuple, _cum_weights
+    weights_tuple = tuple(weights)
+    if weights_tuple != _cached_weights_tuple:
+        _cum_weights = list(itertools.accumulate(weights_tuple))
+        _cached_weights_tuple = weights_tuple
+    # hi=len-1 mirrors random.choices (guards float rounding past the last total), so the RNG stream is unchanged
+    return kinds[bisect.bisect_right(_cum_weights, random.random() * _cum_weights[-1], 0, len(_cum_weights) - 1)]
+
 class PredictiveBattleDirector:
     """Advanced AI system for creating engaging, scripted-looking battles that finish in 61-70 seconds"""
     
@@ -78,13 +197,18 @@ class PredictiveBattleDirector:
         
         # Battle narrative tracking
         self.last_major_event_time = 0
-        self.health_change_history = []  # Track recent health changes to avoid repetition
+        # Recent health changes, stored column-wise (time, orb id, hp delta) in
+        # growable arrays; entries [_hist_lo:_hist_n] are the live window
+        self._hist_times = np.empty(4096, dtype=np.float64)
+        self._hist_orb = np.empty(4096, dtype=np.int8)
+        self._hist_changes = np.empty(4096, dtype=np.int32)
+        self._hist_lo = 0
+        self._hist_n = 0
+        self._hist_orb_ids = {}          # orb name -> id used in _hist_orb
         self.interaction_density = []    # Track interaction frequency over time
         self.orb_aggression_scores = {}  # Track how aggressive each orb has been
         
         # Enhanced damage rate tracking for better duration prediction
-        self.damage_events = []          # Track all damage events with timestamps
-        self.heal_events = []            # Track all heal events with timestamps
         self.last_health_snapshot = {}   # Track orb health at regular intervals
         self.health_snapshot_interval = 5.0  # Take health snapshots every 5 seconds
         self.last_snapshot_time = 0
@@ -93,6 +217,7 @@ class PredictiveBattleDirector:
         self.prediction_horizon = 5.0   # Predict up to 5 seconds ahead (reduced for faster action)
         self.analysis_interval = 1.0    # Re-analyze every 1 second (increased from 2.0)
         self.last_analysis_time = 0
+        self.next_analysis_time = self.last_analysis_time + self.analysis_interval  # Deadline checked every frame
         
         # Battle pacing configuration
         self.early_game_phase = 25      # 0-25s: Setup phase, moderate action
@@ -154,16 +279,16 @@ class PredictiveBattleDirector:
         """Calculate the recent damage rate (HP lost per second)"""
         cutoff_time = current_time - lookback_time
         
-        # Get recent damage events
-        recent_damage = [event for event in self.damage_events if event['time'] > cutoff_time]
-        recent_heals = [event for event in self.heal_events if event['time'] > cutoff_time]
+        # Get recent health changes
+        lo, n = self._hist_lo, self._hist_n
+        recent = self._hist_changes[lo:n][self._hist_times[lo:n] > cutoff_time]
         
-        if not recent_damage and not recent_heals:
+        if not recent.any():
             return 0.0
         
         # Calculate net damage over the period
-        total_damage = sum(event['damage'] for event in recent_damage)
-        total_healing = sum(event['healing'] for event in recent_heals)
+        total_damage = -int(recent[recent < 0].sum())
+        total_healing = int(recent[recent > 0].sum())
         net_damage = total_damage - total_healing
         
         if lookback_time <= 0:
@@ -280,41 +405,23 @@ class PredictiveBattleDirector:
             return predictions
         
         # Use existing prediction system to forecast orb positions
-        game_env_params = {
-            "arena_width": battle_context.arena_width,
-            "arena_height": battle_context.arena_height, 
-            "border_thickness": battle_context.border_thickness_cfg,
-            "space_damping": 0.99,
-            "max_velocity": 500,
-            "physics_substeps": 3
-        }
+        arena_w = battle_context.arena_width
+        arena_h = battle_context.arena_height
+        border_thickness = battle_context.border_thickness_cfg
         
         # Sample multiple time points to predict interaction opportunities (faster sampling)
         time_samples = [0.5, 1.0, 1.5, 2.5, 3.5]
         
+        # Orb state is read once into index-addressed arrays; every orb takes part in each prediction
+        positions, velocities, radii, _ = battle_context.snapshot_orb_state()
+        
         for t in time_samples:
             orb_positions = []
             for orb in orbs:
-                target_data = {
-                    "name": orb.name,
-                    "pos": orb.body.position,
-                    "vel": orb.body.velocity,
-                    "radius": orb.shape.radius,
-                    "id": id(orb)
-                }
-                other_orbs_data = [
-                    {
-                        "name": other.name,
-                        "pos": other.body.position,
-                        "vel": other.body.velocity, 
-                        "radius": other.shape.radius,
-                        "id": id(other)
-                    }
-                    for other in orbs if other != orb
-                ]
-                
                 predicted_pos = predict_orb_future_path_point(
-                    target_data, other_orbs_data, game_env_params, 
+                    orb.index, positions, velocities, radii, None,
+                    arena_w, arena_h, border_thickness,
+                    0.99, 500, 3,  # damping, max velocity, physics substeps
                     t, int(t * 60)  # 60 FPS
                 )
                 orb_positions.append((orb, predicted_pos))
@@ -612,53 +719,52 @@ class PredictiveBattleDirector:
     
     def track_health_change(self, orb_name, old_hp, new_hp, current_time, reason):
         """Track health changes to avoid repetitive patterns and analyze damage rates"""
-        change = {
-            'orb': orb_name,
-            'old_hp': old_hp,
-            'new_hp': new_hp,
-            'change': new_hp - old_hp,
-            'time': current_time,
-            'reason': reason
-        }
-        
-        self.health_change_history.append(change)
+        change = new_hp - old_hp
+        orb_id = self._hist_orb_ids.setdefault(orb_name, len(self._hist_orb_ids))
+        
+        # Make room: slide the live window to the front, growing only if it is full
+        if self._hist_n == len(self._hist_times):
+            lo, n = self._hist_lo, self._hist_n
+            size = len(self._hist_times) * (2 if lo == 0 else 1)
+            for name in ('_hist_times', '_hist_orb', '_hist_changes'):
+                column = getattr(self, name)
+                if size != len(column):
+                    resized = np.empty(size, dtype=column.dtype)
+                    resized[:n - lo] = column[lo:n]
+                    setattr(self, name, resized)
+                else:
+                    column[:n - lo] = column[lo:n]
+            self._hist_lo, self._hist_n = 0, n - lo
         
-        # Track damage and heal events separately for rate analysis
-        if new_hp < old_hp:  # Damage event
-            self.damage_events.append({
-                'orb': orb_name,
-                'damage': old_hp - new_hp,
-                'time': current_time,
-                'reason': reason
-            })
-        elif new_hp > old_hp:  # Heal event
-            self.heal_events.append({
-                'orb': orb_name,
-                'healing': new_hp - old_hp,
-                'time': current_time,
-                'reason': reason
-            })
+        i = self._hist_n
+        self._hist_times[i] = current_time
+        self._hist_orb[i] = orb_id
+        self._hist_changes[i] = change
+        self._hist_n = i + 1
         
-        # Keep only recent history (last 30 seconds for detailed analysis)
+        # Keep only recent history (last 30 seconds for detailed analysis).
+        # Events arrive in time order, so stale entries are always at the front.
         cutoff_time = current_time - 30.0
-        self.health_change_history = [h for h in self.health_change_history if h['time'] > cutoff_time]
-        self.damage_events = [d for d in self.damage_events if d['time'] > cutoff_time]
-        self.heal_events = [h for h in self.heal_events if h['time'] > cutoff_time]
+        self._hist_lo += int(np.searchsorted(self._hist_times[self._hist_lo:self._hist_n], cutoff_time, side='right'))
         
         return change
     
     def should_avoid_repetitive_pattern(self, orb_name, proposed_change, current_time):
         """Check if we should avoid a repetitive health change pattern"""
-        recent_changes = [h for h in self.health_change_history 
-                         if h['orb'] == orb_name and h['time'] > current_time - 10.0]
+        orb_id = self._hist_orb_ids.get(orb_name)
+        if orb_id is None:
+            return False
+        
+        lo, n = self._hist_lo, self._hist_n
+        mask = (self._hist_orb[lo:n] == orb_id) & (self._hist_times[lo:n] > current_time - 10.0)
+        recent_changes = self._hist_changes[lo:n][mask]
         
         if len(recent_changes) < 2:
             return False
         
         # Check for ping-pong pattern (damage -> heal -> damage -> heal)
         if len(recent_changes) >= 3:
-            last_three = recent_changes[-3:]
-            signs = [1 if h['change'] > 0 else -1 for h in last_three]
+            signs = np.where(recent_changes[-3:] > 0, 1, -1).tolist()
             if signs == [1, -1, 1] or signs == [-1, 1, -1]:
                 # Ping-pong pattern detected, avoid if proposed change continues it
                 if (signs[-1] == 1 and proposed_change < 0) or (signs[-1] == -1 and proposed_change > 0):
@@ -677,23 +783,33 @@ class PredictiveBattleDirector:
 
 class AudioRecorder:
     """Records game audio events for export"""
-    def __init__(self, sample_rate=44100):
+    MIX_TILE_SAMPLES = 65536  # Output samples mixed per pass in export_audio
+
+    def __init__(self, sample_rate=44100, enabled=True):
         self.sample_rate = sample_rate
-        self.audio_events = []  # List of (time, sound_data) tuples
+        self.enabled = enabled  # When False, record_sound is a no-op
+        # Recorded events as parallel columns: event_times[i] is when event_sounds[i] starts
+        self.event_times = []
+        self.event_sounds = []
+        self._pcm_cache = {}    # id(sound) -> PCM array, shared by every event of that sound
         
     def record_sound(self, sound, game_time):
         """Record a sound effect at a specific game time"""
-        if sound:
+        if self.enabled and sound:
             try:
-                # Get raw audio data from pygame sound
-                sound_array = pygame.sndarray.array(sound)
-                self.audio_events.append((game_time, sound_array))
+                # Get raw audio data from pygame sound (copied once per Sound object)
+                sound_array = self._pcm_cache.get(id(sound))
+                if sound_array is None:
+                    sound_array = pygame.sndarray.array(sound)
+                    self._pcm_cache[id(sound)] = sound_array
+                self.event_times.append(game_time)
+                self.event_sounds.append(sound_array)
             except Exception as e:
                 print(f"Warning: Could not record sound - {e}")
     
     def export_audio(self, duration, output_path):
         """Export recorded audio to a WAV file with proper mixing and compression"""
-        if not self.audio_events:
+        if not self.event_times:
             print("No audio events recorded")
             return None
             
@@ -702,49 +818,70 @@ class AudioRecorder:
             total_samples = int(duration * self.sample_rate)
             
             # Determine if we need stereo or mono based on first sound
-            is_stereo = len(self.audio_events[0][1].shape) > 1
+            is_stereo = len(self.event_sounds[0].shape) > 1
             if is_stereo:
                 audio_buffer = np.zeros((total_samples, 2), dtype=np.float64)  # Use float64 for better precision
             else:
                 audio_buffer = np.zeros(total_samples, dtype=np.float64)
             
-            print(f"Mixing {len(self.audio_events)} audio events...")
-            
-            # Mix all audio events with dynamic volume scaling
-            for i, (game_time, sound_data) in enumerate(self.audio_events):
-                start_sample = int(game_time * self.sample_rate)
-                end_sample = start_sample + len(sound_data)
-                
-                if end_sample <= total_samples:
-                    # Convert sound_data to float for better precision
-                    sound_data = sound_data.astype(np.float64)
-                    
+            print(f"Mixing {len(self.event_times)} audio events...")
+
+            # Place every event in the output buffer at once (the cast truncates like int())
+            event_times = np.array(self.event_times, dtype=np.float64)
+            event_lengths = np.array([len(d) for d in self.event_sounds], dtype=np.int64)
+            start_samples = (event_times * self.sample_rate).astype(np.int64)
+            end_samples = start_samples + event_lengths
+            fits = (end_samples <= total_samples) & (event_lengths > 0)
+
+            # Dynamic volume based on number of simultaneous sounds: count the
+            # events within 0.5 seconds of each one with two binary searches
+            sorted_times = np.sort(event_times)
+            concurrent_sounds = (np.searchsorted(sorted_times, event_times + 0.5, side='left')
+                                 - np.searchsorted(sorted_times, event_times - 0.5, side='right'))
+
+            # Reduce volume more when many sounds are playing simultaneously
+            volume_scales = 0.15 / np.maximum(1, concurrent_sounds * 0.3)  # Dynamic volume scaling
+            volume_scales = np.clip(volume_scales, 0.02, 0.15)  # Clamp between 0.02 and 0.15
+
+            # Prepare each distinct waveform once - float conversion, peak
+            # normalization and channel mapping are shared by all its events
+            waveforms = {}  # id(sound_data) -> normalized float waveform
+            placements = []  # (start_sample, end_sample, waveform, volume_scale)
+            for i in np.flatnonzero(fits):
+                sound_data = self.event_sounds[i]
+                waveform = waveforms.get(id(sound_data))
+                if waveform is None:
                     # Normalize individual sound to prevent one loud sound from dominating
-                    if len(sound_data) > 0:
-                        max_val = np.max(np.abs(sound_data))
-                        if max_val > 0:
-                            sound_data = sound_data / max_val
-                    
+                    max_val = max(int(sound_data.max()), -int(sound_data.min())) or 1
+                    waveform = sound_data.astype(np.float64) / max_val
+
                     # Handle mono/stereo conversion
-                    if len(audio_buffer.shape) > 1 and len(sound_data.shape) == 1:
+                    if len(audio_buffer.shape) > 1 and len(waveform.shape) == 1:
                         # Convert mono to stereo
-                        sound_data = np.column_stack([sound_data, sound_data])
-                    elif len(audio_buffer.shape) == 1 and len(sound_data.shape) > 1:
+                        waveform = np.column_stack([waveform, waveform])
+                    elif len(audio_buffer.shape) == 1 and len(waveform.shape) > 1:
                         # Convert stereo to mono
-                        sound_data = np.mean(sound_data, axis=1)
-                    
-                    # Dynamic volume based on number of simultaneous sounds
-                    # Check how many sounds are playing around this time
-                    concurrent_sounds = sum(1 for t, _ in self.audio_events 
-                                          if abs(t - game_time) < 0.5)  # Within 0.5 seconds
-                    
-                    # Reduce volume more when many sounds are playing simultaneously
-                    volume_scale = 0.15 / max(1, concurrent_sounds * 0.3)  # Dynamic volume scaling
-                    volume_scale = max(0.02, min(0.15, volume_scale))  # Clamp between 0.02 and 0.15
-                    
-                    # Mix the sound with appropriate volume
-                    audio_buffer[start_sample:end_sample] += sound_data * volume_scale
-            
+                        waveform = np.mean(waveform, axis=1)
+                    waveforms[id(sound_data)] = waveform
+                placements.append((int(start_samples[i]), int(end_samples[i]), waveform, volume_scales[i]))
+
+            # Mix tile by tile so each slice of the output buffer stays in cache
+            # while every sound overlapping it is added
+            placements.sort(key=lambda p: p[0])
+            starts = np.array([p[0] for p in placements], dtype=np.int64)
+            longest = max((p[1] - p[0] for p in placements), default=0)
+            for tile_start in range(0, total_samples, self.MIX_TILE_SAMPLES):
+                tile_end = min(tile_start + self.MIX_TILE_SAMPLES, total_samples)
+                # Events starting before tile_start - longest cannot reach this tile
+                first = np.searchsorted(starts, tile_start - longest, side='right')
+                last = np.searchsorted(starts, tile_end, side='left')
+                for start_sample, end_sample, waveform, volume_scale in placements[first:last]:
+                    s = max(start_sample, tile_start)
+                    e = min(end_sample, tile_end)
+                    if s < e:
+                        # Mix the sound with appropriate volume
+                        audio_buffer[s:e] += waveform[s - start_sample:e - start_sample] * volume_scale
+
             # Apply soft compression to prevent clipping
             def soft_compress(audio, threshold=0.8, ratio=4.0):
                 """Apply soft compression to audio"""
@@ -756,13 +893,14 @@ class AudioRecorder:
             
             # Apply compression
             audio_buffer = soft_compress(audio_buffer, threshold=0.7, ratio=3.0)
-            
-            # Final normalization - find peak and normalize to -6dB to leave more headroom
-            peak = np.max(np.abs(audio_buffer))
-            if peak > 0:
-                target_level = 0.5  # -6dB headroom (more conservative)
-                audio_buffer = audio_buffer * (target_level / peak)
-            
+
+            # Final normalization - find peak and normalize to -6dB to leave more headroom.
+            # The gain is applied together with the int16 scaling below (the filter is
+            # linear, so scaling after it gives the same result with one less pass).
+            peak = max(audio_buffer.max(), -audio_buffer.min())
+            target_level = 0.5  # -6dB headroom (more conservative)
+            gain = target_level / peak if peak > 0 else 1.0
+
             # Apply a gentle high-frequency rolloff to prevent harsh digital artifacts
             def gentle_filter(audio):
                 """Apply gentle low-pass filtering to reduce harshness"""
@@ -779,9 +917,10 @@ class AudioRecorder:
             
             audio_buffer = gentle_filter(audio_buffer)
             
-            # Convert to 16-bit with proper clipping prevention
-            audio_buffer = np.clip(audio_buffer, -0.99, 0.99)  # Slightly under full scale
-            audio_buffer = (audio_buffer * 32767).astype(np.int16)
+            # Normalize, clip slightly under full scale and convert to 16-bit in place
+            np.multiply(audio_buffer, gain * 32767, out=audio_buffer)
+            np.clip(audio_buffer, -0.99 * 32767, 0.99 * 32767, out=audio_buffer)
+            audio_buffer = audio_buffer.astype(np.int16)
             
             # Save as WAV file
             with wave.open(str(output_path), 'wb') as wav_file:
@@ -810,9 +949,11 @@ class VideoBackground:
         self.video_path = video_path
         self.video_clip = None
         self.frames = []
+        self.frame_size = (canvas_width, canvas_height)
+        self.frame_dest = (0, 0)  # Top-left blit position that centers frames on the canvas
         self.current_frame_idx = 0
         self.fps = 30  # Default fps for video playback
-        self.frame_time = 0
+        self.frame_time = 0  # Elapsed playback time in seconds
         self.time_per_frame = 1.0 / self.fps
         
         try:
@@ -829,29 +970,31 @@ class VideoBackground:
             self.frames = []
     
     def _preprocess_frames(self):
-        """Convert video frames to rotated/scaled pygame surfaces"""
+        """Convert video frames to rotated/scaled pixel arrays"""
         if not self.video_clip:
             return
             
         try:
-            # Extract all frames as numpy arrays
-            frame_arrays = []
-            for t in np.arange(0, self.video_clip.duration, self.time_per_frame):
-                frame = self.video_clip.get_frame(t)
-                frame_arrays.append(frame)
-            
-            # Process each frame
-            for frame_array in frame_arrays:
-                # Convert to pygame surface
-                frame_surface = pygame.surfarray.make_surface(frame_array.swapaxes(0, 1))
-                
-                # Rotate 90 degrees clockwise (landscape to portrait)
-                rotated_surface = pygame.transform.rotate(frame_surface, -90)
+            frame_count = int(self.video_clip.duration * self.fps)
+
+            # Decode the clip sequentially and process each frame as it arrives
+            for i, frame_array in enumerate(self.video_clip.iter_frames(fps=self.fps, dtype='uint8')):
+                # Rotate 90 degrees clockwise (landscape to portrait); np.rot90 is
+                # only a strided view, so the surface is built in one copy
+                rotated_array = np.rot90(frame_array, k=-1)
+                rotated_surface = pygame.surfarray.make_surface(rotated_array.swapaxes(0, 1))
                 
                 # Scale to fill canvas while maintaining aspect ratio
                 scaled_surface = self._scale_to_fill(rotated_surface)
-                
-                self.frames.append(scaled_surface)
+
+                # Keep all frames in one contiguous (N, H, W, 3) uint8 block
+                if i == 0:
+                    width, height = scaled_surface.get_size()
+                    self.frames = np.empty((frame_count, height, width, 3), dtype=np.uint8)
+                    # All frames share one size, so the centered position is fixed
+                    self.frame_size = (width, height)
+                    self.frame_dest = (self.canvas_width // 2 - width // 2, self.canvas_height // 2 - height // 2)
+                self.frames[i] = pygame.surfarray.pixels3d(scaled_surface).swapaxes(0, 1)
                 
         except Exception as e:
             print(f"Error preprocessing video frames: {e}")
@@ -886,28 +1029,27 @@ class VideoBackground:
     
     def update(self, dt):
         """Update frame timing for animation"""
-        if not self.frames:
+        if len(self.frames) == 0:
             return
             
+        # Derive the frame from total elapsed time so playback neither drifts
+        # nor drops the remainder of dt when a frame boundary is crossed
+        # (the epsilon keeps exact multiples of dt from rounding down)
         self.frame_time += dt
-        if self.frame_time >= self.time_per_frame:
-            self.frame_time = 0
-            self.current_frame_idx = (self.current_frame_idx + 1) % len(self.frames)
+        self.current_frame_idx = int(self.frame_time * self.fps + 1e-6) % len(self.frames)
     
     def draw(self, screen):
         """Draw current frame to screen"""
-        if not self.frames:
+        if len(self.frames) == 0:
             # Fallback to solid color if no video loaded
             screen.fill((20, 20, 20))
             return
-            
-        current_frame = self.frames[self.current_frame_idx]
-        
-        # Center the frame on the canvas
-        frame_rect = current_frame.get_rect()
-        frame_rect.center = (self.canvas_width // 2, self.canvas_height // 2)
+
+        # Wrap the stored pixels in a Surface without copying them
+        current_frame = pygame.image.frombuffer(self.frames[self.current_frame_idx], self.frame_size, 'RGB')
         
-        screen.blit(current_frame, frame_rect)
+        # Draw centered on the canvas
+        screen.blit(current_frame, self.frame_dest)
 
 def main(headless=False, export_only=False):
     cfg = load_cfg(CFG)
@@ -915,7 +1057,6 @@ def main(headless=False, export_only=False):
     # Ensure deterministic behavior in export mode for consistent results
     if export_only:
         random.seed(42)  # Fixed seed for export mode
-        import numpy as np
         np.random.seed(42)
         print("🎲 Using deterministic random seed for consistent export")
     # random.seed(cfg["seed"]) # Seeding is now handled by generator for scenario determinism
@@ -957,8 +1098,8 @@ def main(headless=False, export_only=False):
     pygame.font.init()
     pygame.mixer.init() # Initialize the mixer
     
-    # Initialize audio recorder for both export and watch modes to ensure consistency
-    audio_recorder = AudioRecorder()
+    # Only record audio in export mode; watch mode plays sounds live and exports a silent video
+    audio_recorder = AudioRecorder(enabled=export_only)
     
     # Initialize the advanced AI battle director
     battle_director = PredictiveBattleDirector(target_duration_min=61, target_duration_max=70)
@@ -1019,7 +1160,7 @@ def main(headless=False, export_only=False):
     if not bounce_sfx_list:
         print("Warning: No bounce SFX loaded. Check assets/sfx/bounce/ directory.")
 
-    default_font = pygame.font.SysFont(None, 48)
+    default_font = get_font(48)
     active_text_overlays = []
     camera = Camera()
     particle_emitter = ParticleEmitter()
@@ -1030,6 +1171,11 @@ def main(headless=False, export_only=False):
     clock = pygame.time.Clock()
     
     # Video background removed - using custom gradient animation instead
+    background_gradient_surface, background_grid_surface = build_background_surfaces()
+    # Gradient with the grid already blended in; the pulse only has ~11 alpha levels,
+    # so this is rebuilt a few times a second instead of blending the grid every frame
+    background_composite_surface = background_gradient_surface.copy()
+    background_composite_alpha = None
     
     saw_token_img = pygame.image.load("assets/pickups/saw_token.png").convert_alpha()
     heart_token_img = pygame.image.load("assets/pickups/heart_token.png").convert_alpha()
@@ -1062,7 +1208,9 @@ def main(headless=False, export_only=False):
         "arena_offset_x": 0.0,  # Offset to center the shrinking arena
         "arena_offset_y": 0.0,  # Offset to center the shrinking arena
         "arena_min_size_ratio": 0.6,  # Minimum 60% of original size
-        "last_arena_update": 0.0
+        "last_arena_update": 0.0,
+        # Wall segments created by make_space (top, right, bottom, left), moved in place as the arena shrinks
+        "walls": space.wall_segments
     }
 
     def update_arena_size(current_time, total_duration):
@@ -1098,16 +1246,11 @@ def main(headless=False, export_only=False):
         arena_rect_for_particles.width = new_width
         arena_rect_for_particles.height = new_height
         
-        # Recreate space with new dimensions every 2 seconds to avoid too frequent updates
+        # Move the walls to the new dimensions every 2 seconds to avoid too frequent updates
         if current_time - game_state["last_arena_update"] >= 2.0:
             game_state["last_arena_update"] = current_time
             
-            # Remove old walls
-            shapes_to_remove = [shape for shape in space.shapes if hasattr(shape, 'collision_type') and shape.collision_type == phys.WALL_COLLISION_TYPE]
-            for shape in shapes_to_remove:
-                space.remove(shape)
-            
-            # Add new walls with updated size and offset for centering
+            # Update wall endpoints with new size and offset for centering
             w, h = new_width, new_height
             half_b = BORDER_THICKNESS_CFG / 2.0
             
@@ -1117,18 +1260,13 @@ def main(headless=False, export_only=False):
             p3 = (offset_x + w - half_b, offset_y + h - half_b)
             p4 = (offset_x + half_b, offset_y + h - half_b)
             
-            static_segments = [
-                pymunk.Segment(space.static_body, p1, p2, radius=half_b),  # Top
-                pymunk.Segment(space.static_body, p2, p3, radius=half_b),  # Right
-                pymunk.Segment(space.static_body, p3, p4, radius=half_b),  # Bottom
-                pymunk.Segment(space.static_body, p4, p1, radius=half_b)   # Left
-            ]
-            
-            for s in static_segments:
-                s.elasticity = 1.5  # Extra bouncy walls
-                s.friction = 0.5
-                s.collision_type = phys.WALL_COLLISION_TYPE
-                space.add(s)
+            top, right, bottom, left = game_state["walls"]
+            top.unsafe_set_endpoints(p1, p2)
+            right.unsafe_set_endpoints(p2, p3)
+            bottom.unsafe_set_endpoints(p3, p4)
+            left.unsafe_set_endpoints(p4, p1)
+            # Static shapes are not reindexed automatically after being moved
+            space.reindex_shapes_for_body(space.static_body)
             
             print(f"Arena updated: {new_width:.0f}x{new_height:.0f} ({size_ratio*100:.1f}% of original)")
             
@@ -1152,24 +1290,26 @@ def main(headless=False, export_only=False):
         min_y = arena_offset_y + safety_margin
         max_y = arena_offset_y + current_arena_h - safety_margin
         
-        pickups_to_remove = []
-        for pickup in pickups[:]:  # Copy list to avoid modification during iteration
-            if not pickup.alive:
-                continue
-                
-            pos_x, pos_y = pickup.body.position
-            
-            # Check if pickup is outside valid area or too close to borders
-            if (pos_x < min_x or pos_x > max_x or 
-                pos_y < min_y or pos_y > max_y):
-                print(f"Removing pickup {pickup.kind} at ({pos_x:.1f}, {pos_y:.1f}) - outside arena bounds")
-                pickup.destroy(space)
-                pickups_to_remove.append(pickup)
-        
-        # Remove from pickups list
-        for pickup in pickups_to_remove:
-            if pickup in pickups:
-                pickups.remove(pickup)
+        live_pickups = [pickup for pickup in pickups if pickup.alive]
+        if not live_pickups:
+            return
+        
+        # Check every pickup against the valid area in one vectorized pass
+        positions = np.array([pickup.body.position for pickup in live_pickups], dtype=np.float64)
+        xs, ys = positions[:, 0], positions[:, 1]
+        outside = (xs < min_x) | (xs > max_x) | (ys < min_y) | (ys > max_y)
+        if not outside.any():
+            return
+        
+        # Destroy each out-of-bounds pickup and hand it back to the pool; nothing can take it from
+        # the pool before the pickups list is filtered below, since spawns only happen between frames
+        for i in np.flatnonzero(outside):
+            pickup = live_pickups[i]
+            print(f"Removing pickup {pickup.kind} at ({xs[i]:.1f}, {ys[i]:.1f}) - outside arena bounds")
+            pickup.destroy(space)
+            pickup.release()
+
+        pickups[:] = [pickup for pickup in pickups if pickup.alive]
 
     orbs = []
     pickups = [] # Initialize pickups list here
@@ -1178,6 +1318,7 @@ def main(headless=False, export_only=False):
     # emergency_heart_cooldowns = {} # Orb_name: last_emergency_heart_spawn_time. Still used for safety period hearts.
     item_spawn_cooldowns = {} # Key: f"{orb_name}_{item_kind}", Value: last_spawn_time
     last_unified_pickup_spawn_attempt_time = 0.0
+    next_unified_pickup_spawn_time = last_unified_pickup_spawn_attempt_time + UNIFIED_SPAWN_INTERVAL_SECONDS
 
     # Create the context that director and physics callbacks will use
     # This instance holds references to game objects and state that events might modify.
@@ -1201,12 +1342,26 @@ def main(headless=False, export_only=False):
         audio_recorder # Pass audio recorder for export mode
     )
 
+    # Clamp bounds for predicted spawn points; the physics arena and radii are fixed for the whole game
+    spawn_edge_margin = battle_context.border_thickness_cfg + battle_context.orb_radius_cfg + battle_context.pickup_radius
+    spawn_min_x = spawn_edge_margin
+    spawn_max_x = battle_context.arena_width - spawn_edge_margin
+    spawn_min_y = spawn_edge_margin
+    spawn_max_y = battle_context.arena_height - spawn_edge_margin
+
+    def on_orb_health_change(orb_name, old_hp, new_hp, timestamp, change_type):
+        """Keep game_state["live_orb_count"] in step with HP changes, then notify the AI Director"""
+        if old_hp > 0 >= new_hp:
+            game_state["live_orb_count"] -= 1
+        elif new_hp > 0 >= old_hp: # A heart can bring an orb back from 0 HP
+            game_state["live_orb_count"] += 1
+        battle_director.track_health_change(orb_name, old_hp, new_hp, timestamp, change_type)
+
     for orb_config_data in cfg["orbs"]:
         logo_path = orb_config_data.get("logo", "assets/pickups/blade.png") # Fallback logo
-        img = pygame.image.load(logo_path).convert_alpha()
         # Scale logo based on actual orb_radius from config
         scaled_size = int(ORB_RADIUS_CFG * 2), int(ORB_RADIUS_CFG * 2)
-        img = pygame.transform.smoothscale(img, scaled_size)
+        img = load_scaled_logo(logo_path, scaled_size)
         
         orb_name = orb_config_data.get("name", "Unknown Orb")
         orb_max_hp = orb_config_data.get("max_hp", 6)
@@ -1215,20 +1370,25 @@ def main(headless=False, export_only=False):
         initial_vel = tuple(orb_config_data.get("initial_velocity", [0,0]))
 
         orb = Orb(orb_name, img, None, None, orb_max_hp, outline_color=orb_color)
+        orb.index = len(orbs)  # Row of this orb in the prediction state arrays
+        # item_spawn_cooldowns keys for this orb, built once instead of per spawn check
+        orb.cooldown_keys = {kind: f"{orb_name}_{kind}" for kind in PICKUP_KINDS_WEIGHTS}
         orb.attach_shape(space, radius=ORB_RADIUS_CFG) # Use ORB_RADIUS_CFG
         
         # Set initial position and velocity from the config
         orb.body.position = initial_pos
         orb.body.velocity = initial_vel
         
-        # Set up AI Director health change callback
-        orb.health_change_callback = battle_director.track_health_change
+        # Set up live-orb counting and the AI Director health change callback
+        orb.health_change_callback = on_orb_health_change
         
         # Set up shield loss callback to play sound effect
         orb.shield_loss_callback = lambda: battle_context.play_sfx(battle_context.shield_loss_sfx)
         
         orbs.append(orb)
 
+    game_state["live_orb_count"] = sum(1 for o in orbs if o.hp > 0)
+
     register_orb_collisions(space, battle_context)  # Pass context
     register_saw_hits(space, battle_context)      # Pass context
     register_pickup_handler(space, battle_context) # Pass context
@@ -1236,9 +1396,25 @@ def main(headless=False, export_only=False):
     # saws = [] # Moved up
     # pickups = [] # Moved up
 
-    frames, winner = [], None
+    winner = None
     current_game_time_sec = 0.0 # Initialize current game time
     frames_to_generate = int(DURATION_SECONDS * GAME_FPS)
+
+    # Frames are streamed straight into ffmpeg as they are rendered, so memory stays at one frame
+    # regardless of duration. Audio is only known at the end and is muxed in afterwards.
+    OUT.mkdir(exist_ok=True)
+    output_stem = cfg['title'].replace(' ','_')
+    video_path = OUT / f"{output_stem}.mp4"
+    video_only_path = OUT / f"{output_stem}_video_only.mp4"
+    video_writer = FFMPEG_VideoWriter(
+        video_only_path.as_posix(),
+        (CANVAS_W, CANVAS_H),
+        GAME_FPS,
+        codec="libx264",
+        preset="veryfast",  # Faster encode at the same target bitrate
+        bitrate="8000k"  # Higher bitrate for better quality
+    )
+    frames_written = 0
     # Initialize AI strategy for use throughout the loop
     ai_strategy = None
     
@@ -1248,6 +1424,9 @@ def main(headless=False, export_only=False):
 
         for event in pygame.event.get():
             if event.type == pygame.QUIT:
+                # Quitting mid-render exports nothing: drop the partial video-only file
+                video_writer.close()
+                video_only_path.unlink(missing_ok=True)
                 pygame.quit(); return
 
         # director.tick(current_game_time_sec, battle_context) # Removed director.tick()
@@ -1280,29 +1459,33 @@ def main(headless=False, export_only=False):
         camera.update(dt)
         particle_emitter.update(dt, arena_rect_for_particles)
 
-        # Update active saws
-        for s in phys.active_saws[:]:
-            if not s.alive: # Saw might have been destroyed by hit or owner death
-                if s in phys.active_saws: # Check if still in list before removing
-                     phys.active_saws.remove(s)
-                continue
-            # s.update() will call s.destroy() if owner is dead, which clears owner.has_saw
-            s.update(dt) 
-            if not s.alive and s in phys.active_saws: # Re-check after update, if it self-destroyed
-                phys.active_saws.remove(s)
-
-        # Update active pickups (for activation timer) # This loop is now only for cleanup
-        for p in pickups[:]: # Iterate a copy for safe removal if needed
-            if not p.alive: # If a pickup was collected and set to not alive by physics
-                if p in pickups:
-                    pickups.remove(p)
+        # Update active saws; reverse index + swap-pop removes dead ones without copying the list
+        active_saws_list = phys.active_saws
+        for i in range(len(active_saws_list) - 1, -1, -1):
+            s = active_saws_list[i]
+            if s.alive:
+                # s.update() will call s.destroy() if owner is dead, which clears owner.has_saw
+                s.update(dt)
+            if not s.alive: # Destroyed by a hit, owner death, or during the update above
+                active_saws_list[i] = active_saws_list[-1]
+                active_saws_list.pop()
+
+        # Drop pickups collected (set to not alive) by physics; swap-pop keeps each removal O(1)
+        for i in range(len(pickups) - 1, -1, -1):
+            if not pickups[i].alive:
+                pickups[i].release()
+                pickups[i] = pickups[-1]
+                pickups.pop()
 
         # --- AI Director Analysis ---
-        if current_game_time_sec >= battle_director.last_analysis_time + battle_director.analysis_interval:
+        if current_game_time_sec >= battle_director.next_analysis_time:
             ai_strategy = battle_director.analyze_battle_state(current_game_time_sec, orbs, battle_context)
             battle_director.last_analysis_time = current_game_time_sec
+            battle_director.next_analysis_time = current_game_time_sec + battle_director.analysis_interval
             
             # Process immediate spawns from AI director
+            orbs_by_name = {o.name: o for o in reversed(orbs)}  # reversed: first orb wins on duplicate names
+            live_orbs = [o for o in orbs if o.hp > 0]
             for spawn_plan in ai_strategy['immediate_spawns']:
                 if len(pickups) < MAX_PICKUPS_ON_SCREEN:
                     # Check bomb limit before spawning
@@ -1313,10 +1496,10 @@ def main(headless=False, export_only=False):
                     # Find the target orb
                     target_orb = None
                     if spawn_plan.get('target_orb'):
-                        target_orb = next((o for o in orbs if o.name == spawn_plan['target_orb']), None)
+                        target_orb = orbs_by_name.get(spawn_plan['target_orb'])
                     
                     if not target_orb:
-                        target_orb = random.choice([o for o in orbs if o.hp > 0] or orbs)
+                        target_orb = random.choice(live_orbs or orbs)
                     
                     # Track bomb spawns
                     if spawn_plan['type'] == 'bomb':
@@ -1346,10 +1529,12 @@ def main(headless=False, export_only=False):
         
         # --- Unified Dynamic Pickup Spawning Logic Integration ---
         num_current_pickups = len(pickups)
-        if current_game_time_sec >= last_unified_pickup_spawn_attempt_time + UNIFIED_SPAWN_INTERVAL_SECONDS:
+        if current_game_time_sec >= next_unified_pickup_spawn_time:
             if num_current_pickups < MAX_PICKUPS_ON_SCREEN:
+                # Live orbs don't change within this block, so filter once
+                live_orbs = [o for o in orbs if o.hp > 0]
                 # Default target orb if no specific assistance is triggered
-                default_target_orb = random.choice([o for o in orbs if o.hp > 0] or orbs) 
+                default_target_orb = random.choice(live_orbs or orbs)
                 target_orb_for_spawn = default_target_orb
                 chosen_kind_for_spawn = None
                 # spawn_emergency_heart_for_targeted_orb = None # Replaced by more generic system
@@ -1357,12 +1542,13 @@ def main(headless=False, export_only=False):
 
                 if current_game_time_sec < SAFETY_PERIOD_SECONDS:
                     # Shuffle orbs to give different orbs priority in checks if multiple are low HP
-                    shuffled_orbs = random.sample([o for o in orbs if o.hp > 0], len([o for o in orbs if o.hp > 0]))
+                    # random.sample (not shuffle) keeps the same RNG draws as before
+                    shuffled_orbs = random.sample(live_orbs, len(live_orbs))
                     for orb_check in shuffled_orbs:
                         if orb_check.hp <= LOW_HEALTH_THRESHOLD: # hp > 0 check already in shuffled_orbs list comp
                             # 1. Prioritize HEART
-                            heart_cooldown_key = f"{orb_check.name}_heart"
-                            last_heart_spawn_time = item_spawn_cooldowns.get(heart_cooldown_key, -float('inf'))
+                            heart_cooldown_key = orb_check.cooldown_keys["heart"]
+                            last_heart_spawn_time = item_spawn_cooldowns.get(heart_cooldown_key, _NEG_INF)
                             if current_game_time_sec >= last_heart_spawn_time + EMERGENCY_HEART_COOLDOWN_SECONDS:
                                 chosen_kind_for_spawn = "heart"
                                 target_orb_for_spawn = orb_check
@@ -1372,8 +1558,8 @@ def main(headless=False, export_only=False):
 
                             # 2. Prioritize SAW if no heart given and orb lacks saw
                             if not orb_check.has_saw:
-                                saw_cooldown_key = f"{orb_check.name}_saw"
-                                last_saw_spawn_time = item_spawn_cooldowns.get(saw_cooldown_key, -float('inf'))
+                                saw_cooldown_key = orb_check.cooldown_keys["saw"]
+                                last_saw_spawn_time = item_spawn_cooldowns.get(saw_cooldown_key, _NEG_INF)
                                 if current_game_time_sec >= last_saw_spawn_time + ASSISTANCE_ITEM_COOLDOWN_SECONDS:
                                     chosen_kind_for_spawn = "saw"
                                     target_orb_for_spawn = orb_check
@@ -1383,8 +1569,8 @@ def main(headless=False, export_only=False):
                             
                             # 3. Prioritize SHIELD if no heart/saw given and orb lacks shield
                             if not orb_check.is_shielded:
-                                shield_cooldown_key = f"{orb_check.name}_shield"
-                                last_shield_spawn_time = item_spawn_cooldowns.get(shield_cooldown_key, -float('inf'))
+                                shield_cooldown_key = orb_check.cooldown_keys["shield"]
+                                last_shield_spawn_time = item_spawn_cooldowns.get(shield_cooldown_key, _NEG_INF)
                                 if current_game_time_sec >= last_shield_spawn_time + ASSISTANCE_ITEM_COOLDOWN_SECONDS:
                                     chosen_kind_for_spawn = "shield"
                                     target_orb_for_spawn = orb_check
@@ -1416,8 +1602,7 @@ def main(headless=False, export_only=False):
                     available_kinds = list(weights_to_use.keys())
                     kind_weights = [weights_to_use[k] for k in available_kinds]
                     if available_kinds: # Should always be true with current weights
-                        chosen_kind_list = random.choices(available_kinds, weights=kind_weights, k=1)
-                        chosen_kind_for_spawn = chosen_kind_list[0]
+                        chosen_kind_for_spawn = weighted_choice(available_kinds, kind_weights)
 
                 if chosen_kind_for_spawn and target_orb_for_spawn and target_orb_for_spawn.hp > 0:
                     prediction_duration = random.uniform(UNIFIED_PREDICTION_TIME_MIN_SECONDS, UNIFIED_PREDICTION_TIME_MAX_SECONDS)
@@ -1426,54 +1611,28 @@ def main(headless=False, export_only=False):
                         prediction_duration = EMERGENCY_HEART_PREDICTION_TIME_SECONDS 
                     
                     # --- Data for advanced prediction --- 
-                    target_orb_sim_data = {
-                        "name": target_orb_for_spawn.name, 
-                        "pos": pymunk.Vec2d(target_orb_for_spawn.body.position.x, target_orb_for_spawn.body.position.y),
-                        "vel": pymunk.Vec2d(target_orb_for_spawn.body.velocity.x, target_orb_for_spawn.body.velocity.y),
-                        "radius": target_orb_for_spawn.shape.radius,
-                        "id": id(target_orb_for_spawn) # Unique ID for mapping
-                    }
-                    all_other_orbs_sim_data = [
-                        {"name": o.name, 
-                         "pos": pymunk.Vec2d(o.body.position.x, o.body.position.y),
-                         "vel": pymunk.Vec2d(o.body.velocity.x, o.body.velocity.y),
-                         "radius": o.shape.radius,
-                         "id": id(o)}
-                        for o in orbs if o != target_orb_for_spawn and o.hp > 0 # Only live orbs affect path
-                    ]
-                    game_env_sim_params = {
-                        "arena_width": battle_context.arena_width,
-                        "arena_height": battle_context.arena_height,
-                        "border_thickness": battle_context.border_thickness_cfg,
-                        "space_damping": space.damping, # Get damping from main space
-                        "max_velocity": PRED_MAX_ORB_VELOCITY,
-                        "physics_substeps": PHYSICS_SUBSTEPS
-                    }
+                    # Only live orbs affect path (the target is live, checked above)
+                    orb_positions, orb_velocities, orb_radii, orb_alive = battle_context.snapshot_orb_state()
                     num_prediction_steps = int(prediction_duration / (1.0 / GAME_FPS)) # Match game's physics rate for steps
 
                     final_spawn_pos_vec = predict_orb_future_path_point(
-                        target_orb_sim_data, 
-                        all_other_orbs_sim_data, 
-                        game_env_sim_params, 
+                        target_orb_for_spawn.index,
+                        orb_positions, orb_velocities, orb_radii, orb_alive,
+                        battle_context.arena_width, battle_context.arena_height,
+                        battle_context.border_thickness_cfg,
+                        space.damping, # Get damping from main space
+                        PRED_MAX_ORB_VELOCITY, PHYSICS_SUBSTEPS,
                         prediction_duration, 
                         max(1, num_prediction_steps) # Ensure at least 1 step
                     )
                     final_spawn_pos = (final_spawn_pos_vec.x, final_spawn_pos_vec.y)
                     
                     # Clamping is still important after prediction
-                    min_x = battle_context.border_thickness_cfg + battle_context.orb_radius_cfg + battle_context.pickup_radius
-                    max_x = battle_context.arena_width - battle_context.border_thickness_cfg - battle_context.orb_radius_cfg - battle_context.pickup_radius
-                    min_y = battle_context.border_thickness_cfg + battle_context.orb_radius_cfg + battle_context.pickup_radius
-                    max_y = battle_context.arena_height - battle_context.border_thickness_cfg - battle_context.orb_radius_cfg - battle_context.pickup_radius
-                    clamped_x = max(min_x, min(final_spawn_pos[0], max_x))
-                    clamped_y = max(min_y, min(final_spawn_pos[1], max_y))
+                    clamped_x = max(spawn_min_x, min(final_spawn_pos[0], spawn_max_x))
+                    clamped_y = max(spawn_min_y, min(final_spawn_pos[1], spawn_max_y))
                     final_spawn_pos = (clamped_x, clamped_y)
                     
-                    img_surface = None
-                    if chosen_kind_for_spawn == "heart": img_surface = heart_token_img
-                    elif chosen_kind_for_spawn == "saw": img_surface = saw_token_img
-                    elif chosen_kind_for_spawn == "shield": img_surface = shield_token_img
-                    elif chosen_kind_for_spawn == "bomb": img_surface = bomb_token_img
+                    img_surface = battle_context.pickup_img_by_kind.get(chosen_kind_for_spawn)
 
                     if img_surface:
                         # Check bomb limit and enforce rules
@@ -1485,7 +1644,7 @@ def main(headless=False, export_only=False):
                             else:
                                 battle_director.track_bomb_spawn()
                         
-                        new_pickup = Pickup(
+                        new_pickup = Pickup.spawn(
                             kind=chosen_kind_for_spawn,
                             img_surface=img_surface,
                             pos=final_spawn_pos,
@@ -1497,16 +1656,16 @@ def main(headless=False, export_only=False):
                         # if spawn_emergency_heart_for_targeted_orb: # Old system
                         #     emergency_heart_cooldowns[spawn_emergency_heart_for_targeted_orb.name] = current_game_time_sec
                         if specific_orb_assisted: # New system: update cooldown for the specific item and orb
-                            cooldown_key = f"{target_orb_for_spawn.name}_{chosen_kind_for_spawn}"
+                            cooldown_key = target_orb_for_spawn.cooldown_keys[chosen_kind_for_spawn]
                             item_spawn_cooldowns[cooldown_key] = current_game_time_sec
             
             last_unified_pickup_spawn_attempt_time = current_game_time_sec
+            next_unified_pickup_spawn_time = last_unified_pickup_spawn_attempt_time + UNIFIED_SPAWN_INTERVAL_SECONDS
 
         # phys.handle_bomb_explosions(...) is removed as bombs are instant.
 
-        living = [o for o in orbs if o.hp > 0]
-        if winner is None and len(living) == 1 and len(orbs) > 1: # Ensure game started with >1 orb
-            winner = living[0]
+        if winner is None and game_state["live_orb_count"] == 1 and len(orbs) > 1: # Ensure game started with >1 orb
+            winner = next(o for o in orbs if o.hp > 0)
             win_frame = frame_i
             print(f"WINNER: {winner.name} at frame {win_frame} ({current_game_time_sec:.2f}s)")
             # Optionally add a text overlay for winner announcement via director or directly
@@ -1529,42 +1688,19 @@ def main(headless=False, export_only=False):
                 game_state["border_flash_until_time"] = 0 
         # else: color remains original color (or whatever it was last set to)
 
-        # Enhanced cyberpunk background
-        # Create gradient background for neon aesthetic
-        background_surface = pygame.Surface((CANVAS_W, CANVAS_H))
-        
-        # Create a dark gradient from top to bottom
-        for y in range(CANVAS_H):
-            # Dark blue to purple gradient
-            progress = y / CANVAS_H
-            r = int(20 + progress * 40)   # 20 to 60
-            g = int(25 + progress * 35)   # 25 to 60  
-            b = int(80 + progress * 60)   # 80 to 140
-            color = (r, g, b)
-            pygame.draw.line(background_surface, color, (0, y), (CANVAS_W, y))
-        
-        # Add subtle grid pattern for cyberpunk effect
+        # Enhanced cyberpunk background: prebuilt gradient plus the pulsing grid,
+        # whose surface alpha is the only thing that changes per frame
         grid_alpha = int(20 + 10 * abs(math.sin(current_game_time_sec * 0.5)))  # Pulsing grid
-        grid_color = (0, 150, 200, grid_alpha)
-        
-        # Vertical grid lines
-        for x in range(0, CANVAS_W, 80):
-            grid_surface = pygame.Surface((2, CANVAS_H), pygame.SRCALPHA)
-            grid_surface.fill(grid_color)
-            background_surface.blit(grid_surface, (x, 0))
-        
-        # Horizontal grid lines  
-        for y in range(0, CANVAS_H, 80):
-            grid_surface = pygame.Surface((CANVAS_W, 2), pygame.SRCALPHA)
-            grid_surface.fill(grid_color)
-            background_surface.blit(grid_surface, (0, y))
-        
-        screen.blit(background_surface, (0, 0))
+        if grid_alpha != background_composite_alpha:
+            background_composite_surface.blit(background_gradient_surface, (0, 0))
+            background_grid_surface.set_alpha(grid_alpha)
+            background_composite_surface.blit(background_grid_surface, (0, 0))
+            background_composite_alpha = grid_alpha
+        screen.blit(background_composite_surface, (0, 0))
 
         # Draw HP bars at the top
-        for i, orb in enumerate(battle_context.orbs):
-            # The 'y' parameter is no longer needed as it's calculated internally by draw_top_hp_bar
-            draw_top_hp_bar(screen, orb, index=i, total_orbs=len(battle_context.orbs))
+        # Reused between frames unless HP or the grid pulse under the bars changes
+        draw_top_hp_bars(screen, battle_context.orbs, background_composite_alpha)
 
         # Arena rendering offsets
         # ARENA_X0 is now 0, so render_offset_x is just camera.offset.x
@@ -1582,18 +1718,9 @@ def main(headless=False, export_only=False):
                                  current_arena_width, current_arena_height)
         border_color = game_state["border_current_color"]
         
-        # Create multiple glow layers for neon effect
-        glow_layers = [
-            (BORDER_THICKNESS_CFG + 20, (*border_color, 30)),   # Outermost glow
-            (BORDER_THICKNESS_CFG + 12, (*border_color, 60)),   # Middle glow  
-            (BORDER_THICKNESS_CFG + 6, (*border_color, 100)),   # Inner glow
-        ]
-        
-        # Draw glow layers
-        for thickness, glow_color in glow_layers:
-            glow_surface = pygame.Surface((border_rect.width + thickness*2, border_rect.height + thickness*2), pygame.SRCALPHA)
-            glow_rect_surface = pygame.Rect(thickness, thickness, border_rect.width, border_rect.height)
-            pygame.draw.rect(glow_surface, glow_color, glow_rect_surface, width=thickness)
+        # Draw glow layers (cached; only rebuilt when the arena size or border color changes)
+        for thickness, glow_surface in get_border_glow_layers(border_rect.width, border_rect.height,
+                                                              border_color, BORDER_THICKNESS_CFG):
             screen.blit(glow_surface, (border_rect.x - thickness, border_rect.y - thickness))
         
         # Draw main border with enhanced width
@@ -1612,11 +1739,14 @@ def main(headless=False, export_only=False):
         particle_emitter.draw(screen, effective_arena_offset_for_particles)
 
         current_time_for_overlay = current_game_time_sec
-        for overlay in active_text_overlays[:]:
+        # Blit live overlays and compact them in the same pass (order kept so later overlays stay on top)
+        kept_overlays = 0
+        for overlay in active_text_overlays:
             if current_time_for_overlay < overlay["end_time"]:
                 screen.blit(overlay["surface"], overlay["rect"])
-            else:
-                active_text_overlays.remove(overlay)
+                active_text_overlays[kept_overlays] = overlay
+                kept_overlays += 1
+        del active_text_overlays[kept_overlays:]
 
         for p in pickups:
             p.draw(screen, offset=(arena_render_offset_x, arena_render_offset_y))
@@ -1639,7 +1769,7 @@ def main(headless=False, export_only=False):
                 
                 # Animated scaling and position
                 base_size = 200 + int(100 * abs(math.sin(current_game_time_sec * 3)))  # Pulsing effect
-                giant = pygame.transform.smoothscale(winner.logo_surface, (base_size, base_size))
+                giant = scale_victory_logo(winner.logo_surface, base_size)
                 
                 # Position below the "GAGNE LE COMBAT" text
                 rect = giant.get_rect(center=(CANVAS_W//2, CANVAS_H//2 + 100))
@@ -1659,7 +1789,10 @@ def main(headless=False, export_only=False):
         if not (headless or export_only):
             pygame.display.flip()
         
-        frames.append(surface_to_array(screen).copy())
+        screen_pixels = pygame.surfarray.pixels3d(screen)  # (W, H, 3) view, no copy
+        video_writer.write_frame(screen_pixels.swapaxes(0, 1))
+        del screen_pixels  # release the surface lock
+        frames_written = frame_i + 1
         
         # Progress indicator for export mode
         if export_only and frame_i % (GAME_FPS * 5) == 0:  # Every 5 seconds
@@ -1674,72 +1807,37 @@ def main(headless=False, export_only=False):
             # In watch mode, maintain proper timing
             clock.tick(GAME_FPS)
 
+    video_writer.close()
     pygame.quit()
-    OUT.mkdir(exist_ok=True)
     
     # Export video with audio if in export mode
-    video_path = OUT / f"{cfg['title'].replace(' ','_')}.mp4"
     final_duration = current_game_time_sec
+    video_duration = frames_written / GAME_FPS
+    print(f"Encoded {frames_written} frames")
     
-    print(f"Creating video from {len(frames)} frames...")
-    video_clip = ImageSequenceClip(frames, fps=GAME_FPS)
-    
-    if audio_recorder and audio_recorder.audio_events:
+    exported_audio_path = None
+    if audio_recorder and audio_recorder.event_times:
         # Export audio and combine with video
         print("Exporting audio...")
-        audio_path = OUT / f"{cfg['title'].replace(' ','_')}_audio.wav"
+        audio_path = OUT / f"{output_stem}_audio.wav"
         exported_audio_path = audio_recorder.export_audio(final_duration, audio_path)
-        
-        if exported_audio_path:
-            print("Combining video with audio...")
-            audio_clip = AudioFileClip(str(exported_audio_path))
-            
-            # Ensure audio length matches video length
-            if audio_clip.duration > video_clip.duration:
-                audio_clip = audio_clip.subclipped(0, video_clip.duration)
-            elif audio_clip.duration < video_clip.duration:
-                # Pad with silence if needed
-                from moviepy.audio.AudioClip import AudioArrayClip
-                import numpy as np  # Import numpy here when needed
-                silence_duration = video_clip.duration - audio_clip.duration
-                silence = AudioArrayClip(np.zeros((int(silence_duration * audio_clip.fps), 2)), fps=audio_clip.fps)
-                audio_clip = CompositeAudioClip([audio_clip, silence.with_start(audio_clip.duration)])
-            
-            final_video = video_clip.with_audio(audio_clip)
-            
-            # Use higher quality audio encoding settings without conflicting filters
-            final_video.write_videofile(
-                video_path.as_posix(), 
-                codec="libx264", 
-                audio_codec="aac",
-                audio_bitrate="192k",  # Higher bitrate for better quality
-                audio_fps=44100       # Ensure proper sample rate
-            )
-            
-            # Keep audio file for debugging - comment out to clean up
-            print(f"Audio file saved for debugging: {exported_audio_path}")
-            # Uncomment the following lines to clean up temporary audio file:
-            # if exported_audio_path.exists():
-            #     exported_audio_path.unlink()
-            
-            audio_clip.close()
-            final_video.close()
-        else:
+        if not exported_audio_path:
             print("No audio exported, saving video without sound...")
-            video_clip.write_videofile(
-                video_path.as_posix(), 
-                codec="libx264",
-                bitrate="8000k"
-            )
+    
+    if exported_audio_path:
+        print("Combining video with audio...")
+        mux_audio_into_video(video_only_path, exported_audio_path, video_path, video_duration)
+        video_only_path.unlink()
+        
+        # Keep audio file for debugging - comment out to clean up
+        print(f"Audio file saved for debugging: {exported_audio_path}")
+        # Uncomment the following lines to clean up temporary audio file:
+        # if exported_audio_path.exists():
+        #     exported_audio_path.unlink()
     else:
         # Export video without audio
-        video_clip.write_videofile(
-            video_path.as_posix(), 
-            codec="libx264",
-            bitrate="8000k"  # Higher bitrate for better quality
-        )
+        video_only_path.replace(video_path)
     
-    video_clip.close()
     print("Saved ->", video_path)
 
 class MainBattleContext:
@@ -1768,6 +1866,12 @@ class MainBattleContext:
         self.shield_token_img = shield_token_img
         self.bomb_token_img = bomb_token_img
         # self.freeze_token_img = freeze_token_img # Removed
+        self.pickup_img_by_kind = {  # kind -> token surface (already convert_alpha()'d at load)
+            "saw": saw_token_img,
+            "heart": heart_token_img,
+            "shield": shield_token_img,
+            "bomb": bomb_token_img,
+        }
         self.blade_img = blade_img
         self.active_text_overlays = active_text_overlays_list
         self.default_font = default_font_instance
@@ -1793,7 +1897,28 @@ class MainBattleContext:
         self.orb_radius_cfg = orb_radius_cfg
         self.border_thickness_cfg = border_thickness_cfg
         self.audio_recorder = audio_recorder
-        
+        # Prediction state, one row per orb (indexed by orb.index); sized on first snapshot
+        self.orb_positions = np.zeros((0, 2))
+        self.orb_velocities = np.zeros((0, 2))
+        self.orb_radii = np.zeros(0)
+        self.orb_alive = np.zeros(0, dtype=bool)
+        
+
+    def snapshot_orb_state(self):
+        """Copy every orb's position, velocity, radius and liveness into the per-orb arrays"""
+        n = len(self.orbs)
+        if len(self.orb_radii) != n:
+            self.orb_positions = np.zeros((n, 2))
+            self.orb_velocities = np.zeros((n, 2))
+            self.orb_radii = np.zeros(n)
+            self.orb_alive = np.zeros(n, dtype=bool)
+        for orb in self.orbs:
+            i = orb.index
+            self.orb_positions[i] = orb.body.position
+            self.orb_velocities[i] = orb.body.velocity
+            self.orb_radii[i] = orb.shape.radius
+            self.orb_alive[i] = orb.hp > 0
+        return self.orb_positions, self.orb_velocities, self.orb_radii, self.orb_alive
 
     def play_sfx(self, sfx_to_play):
         if sfx_to_play:
@@ -1817,85 +1942,53 @@ class MainBattleContext:
         x = payload.get("x")
         y = payload.get("y")
 
-        # Determine position using current arena dimensions and offset (for shrinking arena)
+        # Snapshot current arena dimensions and offset (for shrinking arena) once for every branch below
+        game_state = self.game_state
+        current_arena_w = game_state.get("arena_current_width", self.arena_width)
+        current_arena_h = game_state.get("arena_current_height", self.arena_height)
+        arena_offset_x = game_state.get("arena_offset_x", 0.0)
+        arena_offset_y = game_state.get("arena_offset_y", 0.0)
+        safety_margin = max(self.pickup_radius, 30)  # At least 30px from border
+        if current_arena_w < 2 * safety_margin or current_arena_h < 2 * safety_margin:
+            # Arena has shrunk below the margins, so no position can be inside the safe area
+            print(f"Rejected {kind} pickup spawn - arena {current_arena_w:.1f}x{current_arena_h:.1f} too small")
+            return
+
+        # Determine position, clamped/drawn inside the safe area
         if x is not None and y is not None:
             # Handle normalized (0-1) or absolute coordinates from payload
-            # Use current arena dimensions and offset from game state
-            current_arena_w = self.game_state.get("arena_current_width", self.arena_width)
-            current_arena_h = self.game_state.get("arena_current_height", self.arena_height)
-            arena_offset_x = self.game_state.get("arena_offset_x", 0.0)
-            arena_offset_y = self.game_state.get("arena_offset_y", 0.0)
-
             pos_x = x * current_arena_w if 0 <= x <= 1 else x
             pos_y = y * current_arena_h if 0 <= y <= 1 else y
             # Add offset and clamp to be within arena, with extra safety margin from borders
-            safety_margin = max(self.pickup_radius, 30)  # At least 30px from border
             pos_x = arena_offset_x + max(safety_margin, min(pos_x, current_arena_w - safety_margin))
             pos_y = arena_offset_y + max(safety_margin, min(pos_y, current_arena_h - safety_margin))
             pickup_pos = (pos_x, pos_y)
-        else: # Random position if x or y is missing
-            # Use current arena dimensions and offset from game state
-            current_arena_w = self.game_state.get("arena_current_width", self.arena_width)
-            current_arena_h = self.game_state.get("arena_current_height", self.arena_height)
-            arena_offset_x = self.game_state.get("arena_offset_x", 0.0)
-            arena_offset_y = self.game_state.get("arena_offset_y", 0.0)
-            
-            # Use safety margin for random spawning too
-            safety_margin = max(self.pickup_radius, 30)  # At least 30px from border
+        else: # Random position if x or y is missing, with the same safety margin
             rand_x = random.uniform(safety_margin, current_arena_w - safety_margin)
             rand_y = random.uniform(safety_margin, current_arena_h - safety_margin)
             pickup_pos = (arena_offset_x + rand_x, arena_offset_y + rand_y)
 
-        img_surface = None
-        if kind == "saw": img_surface = self.saw_token_img
-        elif kind == "heart": img_surface = self.heart_token_img
-        elif kind == "shield": img_surface = self.shield_token_img
-        elif kind == "bomb": img_surface = self.bomb_token_img
-        # elif kind == "freeze": img_surface = self.freeze_token_img # Removed
-        else: print(f"Warning: Unknown pickup kind '{kind}' in event, no image.")
-
-        if img_surface:
-            # Validate final position is within safe bounds
-            final_x, final_y = pickup_pos
-            current_arena_w = self.game_state.get("arena_current_width", self.arena_width)
-            current_arena_h = self.game_state.get("arena_current_height", self.arena_height)
-            arena_offset_x = self.game_state.get("arena_offset_x", 0.0)
-            arena_offset_y = self.game_state.get("arena_offset_y", 0.0)
-            
-            safety_margin = max(self.pickup_radius, 30)
-            min_x = arena_offset_x + safety_margin
-            max_x = arena_offset_x + current_arena_w - safety_margin
-            min_y = arena_offset_y + safety_margin
-            max_y = arena_offset_y + current_arena_h - safety_margin
-            
-            # Only create pickup if position is valid
-            if min_x <= final_x <= max_x and min_y <= final_y <= max_y:
-                new_pickup = Pickup(kind, img_surface, pickup_pos, self.space, radius=self.pickup_radius)
-                self.pickups.append(new_pickup)
-                print(f"Spawned {kind} pickup at ({final_x:.1f}, {final_y:.1f}) within arena bounds")
-                
-                if kind == "bomb": # If a bomb pickup is spawned (this is for the pickup itself, not explosion)
-                    # You might not flash for bomb *spawn*, but for its *explosion*.
-                    # For demonstration, let's say picking up a bomb item also causes a small flash.
-                    # This is an example of how to call the flash logic.
-                    # self.game_state["border_current_color"] = self.game_state["border_flash_color_config"]
-                    # self.game_state["border_flash_until_time"] = self.current_game_time_sec + 0.5 # Short flash for pickup
-                    pass
-            else:
-                print(f"Rejected {kind} pickup spawn at ({final_x:.1f}, {final_y:.1f}) - outside safe arena bounds")
-        else:
+        img_surface = self.pickup_img_by_kind.get(kind)
+        if img_surface is None:
+            print(f"Warning: Unknown pickup kind '{kind}' in event, no image.")
             print(f"Could not spawn pickup of kind '{kind}' due to missing image.")
+            return
+
+        new_pickup = Pickup.spawn(kind, img_surface, pickup_pos, self.space, radius=self.pickup_radius)
+        self.pickups.append(new_pickup)
+        print(f"Spawned {kind} pickup at ({pickup_pos[0]:.1f}, {pickup_pos[1]:.1f}) within arena bounds")
 
-    def handle_text_overlay_event(self, payload):
+    def handle_text_overlay_event(self, payload, event_time=None):
+        """Queue a text overlay; event_time defaults to now and is not read from the payload"""
+        if event_time is None:
+            event_time = self.current_game_time_sec
         text = payload.get("text", "Default Text")
         duration = payload.get("duration", 3.0)
         position_key = payload.get("position", "center") 
         color = payload.get("color", (255, 255, 255))
         font_size = payload.get("font_size", 48)
-        event_time = payload.get("event_time")
 
-        custom_font = pygame.font.SysFont(None, font_size)
-        text_surface = custom_font.render(text, True, color)
+        text_surface = render_overlay_text(text, font_size, tuple(color))
         rect = text_surface.get_rect()
 
         if position_key == "center":
@@ -1938,15 +2031,18 @@ class MainBattleContext:
         self.game_state["victory_time"] = self.current_game_time_sec
         
         # Clear all pickups and saws from arena
-        for pickup in self.pickups[:]:  # Copy list to avoid modification during iteration
+        # Pop before destroying so nothing iterates a list that is being emptied
+        pickups = self.pickups
+        while pickups:
+            pickup = pickups.pop()
             pickup.destroy(self.space)
-        self.pickups.clear()
+            pickup.release()
         
         # Remove all saws
         import engine.physics as phys
-        for saw in phys.active_saws[:]:
-            saw.destroy()
-        phys.active_saws.clear()
+        active_saws = phys.active_saws
+        while active_saws:
+            active_saws.pop().destroy()
         
         # Add victory text overlay
         victory_text_payload = {
@@ -1955,125 +2051,8 @@ class MainBattleContext:
             "position": "center_top",
             "font_size": 100,
             "color": winning_orb.outline_color,
-            "event_time": self.current_game_time_sec
         }
-        self.handle_text_overlay_event(victory_text_payload)
-
-# Helper function for predictive spawning
-def predict_orb_future_path_point(target_orb_data, all_orbs_data, game_env_params, duration_to_predict, num_steps):
-    """
-    Simulates the target orb's movement in a temporary space to predict future position.
-    target_orb_data: {"name": str, "pos": Vec2d, "vel": Vec2d, "radius": float, "id": int}
-    all_orbs_data: list of dicts, each like target_orb_data, for *other* orbs.
-    game_env_params: {"arena_width": float, "arena_height": float, "border_thickness": float, 
-                      "space_damping": float, "max_velocity": float, "physics_substeps": int}
-    duration_to_predict: float (total time in seconds)
-    num_steps: int (how many steps to divide the duration into for simulation - each step is one game frame)
-    Returns: predicted Vec2d position of the target orb, or its last known if error.
-    """
-    temp_space = pymunk.Space()
-    temp_space.damping = game_env_params["space_damping"]
-    
-    # dt_step is the duration of one main game frame for the prediction
-    # If the main game uses GANE_FPS (e.g. 60), then dt_step = 1/60 if num_steps matches prediction_duration*GAME_FPS
-    # num_steps is int(prediction_duration / (1.0 / GAME_FPS))
-    # So dt_step = prediction_duration / (prediction_duration * GAME_FPS) = 1.0 / GAME_FPS
-    # This is correct: each step in the outer loop simulates one "game frame"
-    dt_per_simulation_step = duration_to_predict / num_steps 
-
-    # Add arena boundaries to temp_space, matching engine/physics.py:make_space
-    # arena_width and arena_height in game_env_params are the inner dimensions of the playable area.
-    # border_thickness is the thickness of the walls.
-    
-    border_segment_radius = game_env_params["border_thickness"] / 2.0
-    arena_w = game_env_params["arena_width"]
-    arena_h = game_env_params["arena_height"]
-
-    # These points define the centerlines of the wall segments.
-    # The segments' own radius (border_segment_radius) makes them thick.
-    # This setup ensures the *inner edges* of the physical walls are at:
-    # y=0, y=arena_h, x=0, x=arena_w.
-
-    # Coordinates for the centerlines of the wall segments
-    # Top: centerline at y = -border_segment_radius. Inner edge at y = 0.
-    # Bottom: centerline at y = arena_h + border_segment_radius. Inner edge at y = arena_h.
-    # Left: centerline at x = -border_segment_radius. Inner edge at x = 0.
-    # Right: centerline at x = arena_w + border_segment_radius. Inner edge at x = arena_w.
-
-    static_body = temp_space.static_body
-    wall_segments_params = [
-        # Top wall
-        ((-border_segment_radius, -border_segment_radius), (arena_w + border_segment_radius, -border_segment_radius), border_segment_radius),
-        # Right wall
-        ((arena_w + border_segment_radius, -border_segment_radius), (arena_w + border_segment_radius, arena_h + border_segment_radius), border_segment_radius),
-        # Bottom wall
-        ((arena_w + border_segment_radius, arena_h + border_segment_radius), (-border_segment_radius, arena_h + border_segment_radius), border_segment_radius),
-        # Left wall
-        ((-border_segment_radius, arena_h + border_segment_radius), (-border_segment_radius, -border_segment_radius), border_segment_radius)
-    ]
-
-    for p1, p2, radius in wall_segments_params:
-        segment = pymunk.Segment(static_body, p1, p2, radius)
-        segment.elasticity = 1.0  # Standard wall elasticity
-        segment.friction = 0.5    # Standard wall friction
-        segment.collision_type = phys.WALL_COLLISION_TYPE # Match main game wall collision type
-        temp_space.add(segment)
-
-    # Add orbs to temp_space
-    temp_orbs_map = {} # id -> Pymunk Body
-
-    # Add target orb first
-    target_body = pymunk.Body(mass=1, moment=float('inf')) 
-    target_body.position = target_orb_data["pos"]
-    target_body.velocity = target_orb_data["vel"]
-    target_shape = pymunk.Circle(target_body, target_orb_data["radius"])
-    target_shape.elasticity = 1.0 # TODO: Get from actual orb config or a shared constant
-    target_shape.friction = 0.1   # TODO: Get from actual orb config or a shared constant
-    target_shape.collision_type = 1 # Orb collision type (assuming 1 for orbs)
-    temp_space.add(target_body, target_shape)
-    temp_orbs_map[target_orb_data["id"]] = target_body
-
-    # Add other orbs
-    for orb_data in all_orbs_data:
-        if orb_data["id"] == target_orb_data["id"]: continue
-        body = pymunk.Body(mass=1, moment=float('inf'))
-        body.position = orb_data["pos"]
-        body.velocity = orb_data["vel"]
-        shape = pymunk.Circle(body, orb_data["radius"])
-        shape.elasticity = 1.0 # TODO: Get from actual orb config
-        shape.friction = 0.1   # TODO: Get from actual orb config
-        shape.collision_type = 1 # Orb collision type
-        temp_space.add(body, shape)
-        temp_orbs_map[orb_data["id"]] = body # Store the body for velocity capping
-    
-    # Main simulation loop (num_steps corresponds to game frames)
-    # If PHYSICS_SUBSTEPS is used in the main game, replicate it here.
-    # physics_substeps = game_env_params.get("physics_substeps", 1) # Default to 1 if not provided
-    # sub_dt = dt_per_simulation_step / physics_substeps
-    
-    # For now, let's assume game_env_params will include "physics_substeps" matching main game
-    # And "game_fps" for calculating sub_dt properly.
-    # The current num_steps results in dt_per_simulation_step being 1/GAME_FPS.
-    # So, this dt_per_simulation_step IS the main game's frame time.
-    
-    main_game_physics_substeps = game_env_params.get("physics_substeps", 1) # Get from params, default 1
-    actual_sub_dt = dt_per_simulation_step / main_game_physics_substeps
-
-    for _ in range(num_steps): # Each step is one "game frame"
-        # Apply velocity cap before stepping physics for this frame
-        for b_id, b in temp_orbs_map.items():
-            velocity = b.velocity
-            speed = velocity.length
-            if speed > game_env_params["max_velocity"]:
-                b.velocity = velocity.normalized() * game_env_params["max_velocity"]
-        
-        # Perform physics sub-steps for this "game frame"
-        for _ in range(main_game_physics_substeps):
-            temp_space.step(actual_sub_dt)
-
-    predicted_pos = temp_orbs_map[target_orb_data["id"]].position
-    # print(f"DEBUG PREDICT: Target '{target_orb_data[\"name\"]}', Start: {target_orb_data[\"pos\"]}, End: {predicted_pos}, Vel: {target_orb_data[\"vel\"]}")
-    return predicted_pos
+        self.handle_text_overlay_event(victory_text_payload, self.current_game_time_sec)
 
 if __name__ == "__main__":
     parser = argparse.ArgumentParser(description="TikTok Battle Game with Export Capabilities")
@@ -9,6 +9,8 @@ import wave
 import argparse
 from pathlib import Path
 
+ANALYSIS_CHUNK_FRAMES = 1 << 20  # Frames decoded per read; keeps memory flat for long exports
+
 def analyze_audio_file(file_path):
     """Analyze audio file for quality metrics"""
     try:
@@ -20,38 +22,46 @@ def analyze_audio_file(file_path):
             num_frames = wav_file.getnframes()
             duration = num_frames / sample_rate
             
-            # Read audio data
-            audio_data = wav_file.readframes(num_frames)
-            audio_array = np.frombuffer(audio_data, dtype=np.int16)
+            # Stream the file in fixed-size chunks, keeping running per-channel stats
+            clipping_threshold = 0.99  # 99% of full scale
+            channel_peaks = np.zeros(num_channels, dtype=np.int64)
+            channel_sumsq = np.zeros(num_channels, dtype=np.int64)
+            clipped_samples = 0
+            total_samples = 0
+            frames_left = num_frames
+            while frames_left > 0:
+                audio_data = wav_file.readframes(min(ANALYSIS_CHUNK_FRAMES, frames_left))
+                if not audio_data:
+                    break
+                # One row per frame and one column per channel
+                audio_array = np.frombuffer(audio_data, dtype=np.int16).reshape(-1, num_channels)
+                frames_left -= len(audio_array)
+                total_samples += audio_array.size
+                
+                # Single int32 magnitude buffer reused for peak, clipping and RMS
+                # (int32 also keeps abs(-32768) from wrapping)
+                magnitudes = np.abs(audio_array.astype(np.int32))
+                np.maximum(channel_peaks, magnitudes.max(axis=0), out=channel_peaks)
+                
+                # Check for clipping (values at or near maximum) in any channel of a frame
+                clipped_samples += np.count_nonzero((magnitudes >= clipping_threshold * 32767).any(axis=1))
+                
+                np.multiply(magnitudes, magnitudes, out=magnitudes)  # squares fit in int32
+                channel_sumsq += magnitudes.sum(axis=0, dtype=np.int64)
+            
+            total_frames = max(total_samples // num_channels, 1)
+            channel_peaks = channel_peaks / 32767.0
+            channel_rms = np.sqrt(channel_sumsq / total_frames) / 32767.0
             
-            if num_channels == 2:
-                audio_array = audio_array.reshape(-1, 2)
-                left_channel = audio_array[:, 0]
-                right_channel = audio_array[:, 1]
-                peak_left = np.max(np.abs(left_channel)) / 32767.0
-                peak_right = np.max(np.abs(right_channel)) / 32767.0
-                peak_overall = max(peak_left, peak_right)
-                rms_left = np.sqrt(np.mean(left_channel.astype(np.float64) ** 2)) / 32767.0
-                rms_right = np.sqrt(np.mean(right_channel.astype(np.float64) ** 2)) / 32767.0
-                rms_overall = (rms_left + rms_right) / 2
-            else:
-                peak_overall = np.max(np.abs(audio_array)) / 32767.0
-                rms_overall = np.sqrt(np.mean(audio_array.astype(np.float64) ** 2)) / 32767.0
+            peak_overall = channel_peaks.max()
+            rms_overall = channel_rms.mean()  # Average of the channels for stereo
             
             # Calculate metrics
             peak_db = 20 * np.log10(peak_overall) if peak_overall > 0 else -np.inf
             rms_db = 20 * np.log10(rms_overall) if rms_overall > 0 else -np.inf
             headroom_db = 0 - peak_db  # dB below 0dBFS
             
-            # Check for clipping (values at or near maximum)
-            clipping_threshold = 0.99  # 99% of full scale
-            if num_channels == 2:
-                clipped_samples = np.sum((np.abs(left_channel) >= clipping_threshold * 32767) | 
-                                       (np.abs(right_channel) >= clipping_threshold * 32767))
-            else:
-                clipped_samples = np.sum(np.abs(audio_array) >= clipping_threshold * 32767)
-            
-            clipping_percentage = (clipped_samples / len(audio_array.flatten())) * 100
+            clipping_percentage = (clipped_samples / max(total_samples, 1)) * 100
             
             return {
                 'file_path': file_path,
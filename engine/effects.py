@@ -1,91 +1,38 @@
 import pygame
-import random
 import math
-from dataclasses import dataclass
+import functools
+import numpy as np
 
-@dataclass
-class Particle:
-    position: pygame.math.Vector2
-    velocity: pygame.math.Vector2
-    lifespan: float
-    max_lifespan: float
-    # For circle particles:
-    radius: float
-    max_radius: float 
-    # Removed length, thickness, angle
-    color: tuple[int, int, int]
-    start_color: tuple[int, int, int]
-    end_color: tuple[int, int, int]
-    bounces_remaining: int
-
-    def __init__(self, position, velocity, lifespan, radius, color, end_color=None):
-        self.position = pygame.math.Vector2(position)
-        self.velocity = pygame.math.Vector2(velocity)
-        self.lifespan = lifespan
-        self.max_lifespan = lifespan
-        self.radius = radius
-        self.max_radius = radius # Initial radius is max_radius
-        self.start_color = color
-        self.end_color = end_color if end_color else color
-        self.color = color
-        self.bounces_remaining = 2 
-
-    def update(self, dt, arena_rect: pygame.Rect, gravity: pygame.math.Vector2, drag: float):
-        if self.lifespan <= 0:
-            return
-
-        # Apply physics
-        self.velocity += gravity * dt
-        self.velocity *= (drag ** dt) 
-        self.position += self.velocity * dt
-        
-        self.lifespan -= dt
-        
-        life_ratio = max(0, self.lifespan / self.max_lifespan)
-        self.radius = self.max_radius * life_ratio # Radius shrinks
-        
-        r = int(self.start_color[0] * life_ratio + self.end_color[0] * (1 - life_ratio))
-        g = int(self.start_color[1] * life_ratio + self.end_color[1] * (1 - life_ratio))
-        b = int(self.start_color[2] * life_ratio + self.end_color[2] * (1 - life_ratio))
-        self.color = (max(0, min(255, r)), max(0, min(255, g)), max(0, min(255, b)))
-
-        # Wall bouncing
-        if self.bounces_remaining > 0 and self.radius > 0:
-            bounce_occurred = False
-            if self.position.x - self.radius < arena_rect.left:
-                self.position.x = arena_rect.left + self.radius
-                self.velocity.x *= -0.7 # Dampen more for circles
-                bounce_occurred = True
-            elif self.position.x + self.radius > arena_rect.right:
-                self.position.x = arena_rect.right - self.radius
-                self.velocity.x *= -0.7
-                bounce_occurred = True
-            
-            if self.position.y - self.radius < arena_rect.top:
-                self.position.y = arena_rect.top + self.radius
-                self.velocity.y *= -0.7
-                bounce_occurred = True
-            elif self.position.y + self.radius > arena_rect.bottom:
-                self.position.y = arena_rect.bottom - self.radius
-                self.velocity.y *= -0.7
-                bounce_occurred = True
-            
-            if bounce_occurred:
-                self.bounces_remaining -= 1
-                if self.bounces_remaining == 0:
-                    self.lifespan = min(self.lifespan, 0.05) # Die very quickly after last bounce
+PARTICLE_CAPACITY = 4096 # Initial particle slots; the arrays double when a burst overflows them
+PARTICLE_WALL_RESTITUTION = -0.7 # Velocity factor on a wall bounce (dampened for circles)
+EFFECT_GRID_SIZE = 80 # Match the arena grid size
+HAS_FBLITS = hasattr(pygame.Surface, "fblits") # pygame-ce only; skips blits()' per-item rect bookkeeping
+PARTICLE_FADE_STEPS = 16 # Color fade advances in steps so particles keep reusing the same stamps
 
-    def draw(self, surface, total_arena_offset_on_screen: pygame.math.Vector2):
-        if self.lifespan > 0 and self.radius >= 1: 
-            render_center_x = self.position.x + total_arena_offset_on_screen.x
-            render_center_y = self.position.y + total_arena_offset_on_screen.y
+def grid_offset_bounds(offset_in_cell, radius, max_offset):
+    """
+    (lo, hi) bounds of the grid offsets k in [-max_offset, max_offset] whose line, k cells from the
+    centre's cell, can lie within radius of a centre offset_in_cell past that cell's line.
+    Conservative: callers still check the exact distance.
+    """
+    lo = max(-max_offset, math.floor((offset_in_cell - radius) / EFFECT_GRID_SIZE))
+    hi = min(max_offset, math.ceil((offset_in_cell + radius) / EFFECT_GRID_SIZE))
+    return lo, hi
 
-            pygame.draw.circle(surface, self.color, 
-                             (int(render_center_x), int(render_center_y)), 
-                             max(1, int(self.radius)))
+@functools.lru_cache(maxsize=1024)
+def particle_stamp(radius, color):
+    """Filled circle drawn once on a colorkeyed square; blitting it at (x - r, y - r) matches draw.circle at (x, y)"""
+    size = 2 * radius + 1
+    key = (255 - color[0], 255 - color[1], 255 - color[2]) # 255 is odd, so this never equals color
+    stamp = pygame.Surface((size, size))
+    stamp.fill(key)
+    stamp.set_colorkey(key, pygame.RLEACCEL) # Stamps are reused many times, so RLE-encoding them pays off
+    pygame.draw.circle(stamp, color, (radius, radius), radius)
+    return stamp
 
-@dataclass
 class Shockwave:
+    __slots__ = ("position", "radius", "max_radius", "lifespan", "max_lifespan", "color", "thickness")
+
     position: pygame.math.Vector2
     radius: float
     max_radius: float
@@ -126,6 +73,14 @@ class Shockwave:
             
             # Enhanced multi-ring shockwave with grid interaction
             base_alpha = int(255 * life_ratio * 0.8)
+            rgb = self.color[:3]
+            
+            # Grid lines that react to the shockwave are the same for every ring
+            grid_size = EFFECT_GRID_SIZE
+            center_grid_x = int((render_center_x) // grid_size) * grid_size
+            center_grid_y = int((render_center_y) // grid_size) * grid_size
+            offset_in_cell_x = render_center_x - center_grid_x
+            offset_in_cell_y = render_center_y - center_grid_y
             
             # Main shockwave rings
             for ring in range(3):
@@ -136,7 +91,7 @@ class Shockwave:
                     
                     # Create surface for each ring
                     ring_surface = pygame.Surface((ring_radius * 2 + 40, ring_radius * 2 + 40), pygame.SRCALPHA)
-                    ring_color = (*self.color[:3], ring_alpha)
+                    ring_color = (*rgb, ring_alpha)
                     
                     # Draw main ring
                     pygame.draw.circle(ring_surface, ring_color, 
@@ -144,22 +99,21 @@ class Shockwave:
                                      int(ring_radius), ring_thickness)
                     
                     # Add grid distortion effect
-                    grid_size = 80  # Match the arena grid size
                     grid_alpha = int(ring_alpha * 0.3)
                     
-                    # Draw intersecting grid lines that react to the shockwave
-                    center_grid_x = int((render_center_x) // grid_size) * grid_size
-                    center_grid_y = int((render_center_y) // grid_size) * grid_size
+                    # Only offsets whose vertical or horizontal line can be inside the ring
+                    lo_x, hi_x = grid_offset_bounds(offset_in_cell_x, ring_radius, 2)
+                    lo_y, hi_y = grid_offset_bounds(offset_in_cell_y, ring_radius, 2)
                     
                     # Highlight nearby grid lines
-                    for grid_offset in range(-2, 3):
+                    for grid_offset in range(min(lo_x, lo_y), max(hi_x, hi_y) + 1):
                         # Vertical lines
                         grid_x = center_grid_x + (grid_offset * grid_size)
                         if abs(grid_x - render_center_x) < ring_radius:
                             intensity = 1.0 - (abs(grid_x - render_center_x) / ring_radius)
                             line_alpha = int(grid_alpha * intensity)
                             if line_alpha > 0:
-                                line_color = (*self.color[:3], line_alpha)
+                                line_color = (*rgb, line_alpha)
                                 line_start = (grid_x - render_center_x + ring_radius + 20, 0)
                                 line_end = (grid_x - render_center_x + ring_radius + 20, ring_radius * 2 + 40)
                                 pygame.draw.line(ring_surface, line_color, line_start, line_end, 3)
@@ -170,7 +124,7 @@ class Shockwave:
                             intensity = 1.0 - (abs(grid_y - render_center_y) / ring_radius)
                             line_alpha = int(grid_alpha * intensity)
                             if line_alpha > 0:
-                                line_color = (*self.color[:3], line_alpha)
+                                line_color = (*rgb, line_alpha)
                                 line_start = (0, grid_y - render_center_y + ring_radius + 20)
                                 line_end = (ring_radius * 2 + 40, grid_y - render_center_y + ring_radius + 20)
                                 pygame.draw.line(ring_surface, line_color, line_start, line_end, 3)
@@ -183,15 +137,16 @@ class Shockwave:
             pulse_alpha = int(base_alpha * 0.4)
             if pulse_alpha > 0:
                 pulse_surface = pygame.Surface((pulse_radius * 2 + 20, pulse_radius * 2 + 20), pygame.SRCALPHA)
-                pulse_color = (*self.color[:3], pulse_alpha)
+                pulse_color = (*rgb, pulse_alpha)
                 pygame.draw.circle(pulse_surface, pulse_color, 
                                  (int(pulse_radius + 10), int(pulse_radius + 10)), 
                                  int(pulse_radius))
                 surface.blit(pulse_surface, (render_center_x - pulse_radius - 10, render_center_y - pulse_radius - 10), 
                            special_flags=pygame.BLEND_ADD)
 
-@dataclass
 class LaserGrid:
+    __slots__ = ("position", "radius", "max_radius", "lifespan", "max_lifespan", "color")
+
     position: pygame.math.Vector2
     radius: float
     max_radius: float
@@ -225,42 +180,65 @@ class LaserGrid:
             life_ratio = max(0, self.lifespan / self.max_lifespan)
             
             # Only show grid lines, no filled circles
-            grid_size = 80  # Match the arena grid size
+            grid_size = EFFECT_GRID_SIZE
             base_alpha = int(255 * life_ratio)
             
             # Find grid center
             center_grid_x = int((render_center_x) // grid_size) * grid_size
             center_grid_y = int((render_center_y) // grid_size) * grid_size
             
-            # Draw laser grid lines within radius
-            for grid_offset in range(-5, 6):
+            # Draw laser grid lines within radius. Additive blits commute, so each axis gets its own
+            # loop over the offsets that can be in range, and one line surface refilled per line.
+            lo, hi = grid_offset_bounds(render_center_x - center_grid_x, self.radius, 5)
+            line_surface = None
+            for grid_offset in range(lo, hi + 1):
                 # Vertical laser lines
                 grid_x = center_grid_x + (grid_offset * grid_size)
                 if abs(grid_x - render_center_x) < self.radius:
                     intensity = 1.0 - (abs(grid_x - render_center_x) / self.radius)
                     line_alpha = int(base_alpha * intensity * 0.8)
                     if line_alpha > 0:
-                        line_color = (*self.color, line_alpha)
-                        line_surface = pygame.Surface((6, self.radius * 2), pygame.SRCALPHA)
-                        line_surface.fill(line_color)
+                        if line_surface is None:
+                            line_surface = pygame.Surface((6, self.radius * 2), pygame.SRCALPHA)
+                        line_surface.fill((*self.color, line_alpha))
                         surface.blit(line_surface, (grid_x - 3, render_center_y - self.radius), 
                                    special_flags=pygame.BLEND_ADD)
-                
+            
+            lo, hi = grid_offset_bounds(render_center_y - center_grid_y, self.radius, 5)
+            line_surface = None
+            for grid_offset in range(lo, hi + 1):
                 # Horizontal laser lines
                 grid_y = center_grid_y + (grid_offset * grid_size)
                 if abs(grid_y - render_center_y) < self.radius:
                     intensity = 1.0 - (abs(grid_y - render_center_y) / self.radius)
                     line_alpha = int(base_alpha * intensity * 0.8)
                     if line_alpha > 0:
-                        line_color = (*self.color, line_alpha)
-                        line_surface = pygame.Surface((self.radius * 2, 6), pygame.SRCALPHA)
-                        line_surface.fill(line_color)
+                        if line_surface is None:
+                            line_surface = pygame.Surface((self.radius * 2, 6), pygame.SRCALPHA)
+                        line_surface.fill((*self.color, line_alpha))
                         surface.blit(line_surface, (render_center_x - self.radius, grid_y - 3), 
                                    special_flags=pygame.BLEND_ADD)
 
+def update_live_effects(effects, dt):
+    """
+    Update the effects that are still alive and drop those that finished last frame,
+    in one in-place pass that keeps draw order.
+    """
+    kept = 0
+    for effect in effects:
+        if effect.lifespan > 0:
+            effect.update(dt)
+            effects[kept] = effect
+            kept += 1
+    del effects[kept:]
+
 class ParticleEmitter:
+    """
+    Circle particles kept as a structure of arrays: row i of every array is particle i,
+    rows [0, particle_count) are in use. update() steps them all in bulk.
+    """
+
     def __init__(self):
-        self.particles: list[Particle] = []
         self.shockwaves: list[Shockwave] = []
         self.laser_grids: list[LaserGrid] = []
         # Define default physics properties for particles, can be overridden in emit or globally changed
@@ -268,15 +246,42 @@ class ParticleEmitter:
         self.drag = 0.98 # Factor per second for velocity reduction (e.g., 0.98 means 2% reduction per sec)
         self.default_particle_bounces = 2
 
+        self.particle_count = 0
+        self._allocate_particles(PARTICLE_CAPACITY)
+
+    def _allocate_particles(self, capacity):
+        """(Re)allocate the particle arrays with room for capacity particles, keeping live rows"""
+        n = self.particle_count
+        fields = (
+            ("positions", (2,), np.float64),
+            ("velocities", (2,), np.float64),
+            ("lifespans", (), np.float64),
+            ("max_lifespans", (), np.float64),
+            ("radii", (), np.float64), # Current radius, shrinks with remaining life
+            ("max_radii", (), np.float64),
+            ("start_colors", (3,), np.float64),
+            ("end_colors", (3,), np.float64),
+            ("colors", (3,), np.uint8), # Current color, lerped from start to end color over the lifespan
+            ("bounces_remaining", (), np.int32),
+        )
+        for name, row_shape, dtype in fields:
+            new_array = np.empty((capacity,) + row_shape, dtype=dtype)
+            if n:
+                new_array[:n] = getattr(self, name)[:n]
+            setattr(self, name, new_array)
+        self.particle_capacity = capacity
+
     def emit(self, num_particles, position, base_particle_color=(200,0,0), 
              base_velocity_scale=60, lifespan_s=0.5, 
              base_max_radius=10, # Changed from max_length
-             # base_thickness is no longer used for circle particles directly in Particle, but can influence visual density if desired elsewhere
+             # base_thickness is no longer used for circle particles, but can influence visual density if desired elsewhere
              fade_to_color=None, 
              impact_normal: pygame.math.Vector2 = None, 
              impact_strength: float = 1.0, 
              orb_radius_ratio: float = 1.0 
              ):
+        if num_particles <= 0:
+            return
         
         # Enhanced neon particle colors
         if fade_to_color is None:
@@ -293,27 +298,38 @@ class ParticleEmitter:
         # Scale particle properties by orb size
         effective_scaled_max_radius = base_max_radius * orb_radius_ratio
 
-        for _ in range(num_particles):
-            if impact_normal:
-                normal_angle_rad = math.atan2(impact_normal.y, impact_normal.x)
-                # Make the splash wider, e.g., +/- 60 to 75 degrees from the normal direction
-                angle_offset = random.uniform(-math.pi * 0.4, math.pi * 0.4) 
-                angle_rad = normal_angle_rad + angle_offset
-                # Significantly increase speed based on impact_strength for a bigger splash
-                speed = random.uniform(base_velocity_scale * 0.8, base_velocity_scale * 1.5) * (1 + impact_strength / 1000.0) 
-            else:
-                angle_rad = random.uniform(0, 2 * math.pi)
-                speed = random.uniform(base_velocity_scale * 0.7, base_velocity_scale * 1.3)
-            
-            velocity = pygame.math.Vector2(math.cos(angle_rad) * speed, math.sin(angle_rad) * speed)
-            
-            particle_lifespan = lifespan_s * random.uniform(0.5, 1.5)
-            # Vary particle sizes more for a splashy look
-            particle_initial_radius = max(1, effective_scaled_max_radius * random.uniform(0.3, 1.0))
-            
-            particle = Particle(position, velocity, particle_lifespan, particle_initial_radius, enhanced_base_color, actual_fade_color)
-            particle.bounces_remaining = self.default_particle_bounces 
-            self.particles.append(particle)
+        # Draw every particle's angle, speed, lifespan and size in one batch each.
+        # NumPy's global RNG is used because export mode seeds it, so exports stay reproducible.
+        if impact_normal:
+            normal_angle_rad = math.atan2(impact_normal.y, impact_normal.x)
+            # Make the splash wider, e.g., +/- 60 to 75 degrees from the normal direction
+            angles = normal_angle_rad + np.random.uniform(-math.pi * 0.4, math.pi * 0.4, num_particles)
+            # Significantly increase speed based on impact_strength for a bigger splash
+            speeds = np.random.uniform(base_velocity_scale * 0.8, base_velocity_scale * 1.5, num_particles) * (1 + impact_strength / 1000.0)
+        else:
+            angles = np.random.uniform(0, 2 * math.pi, num_particles)
+            speeds = np.random.uniform(base_velocity_scale * 0.7, base_velocity_scale * 1.3, num_particles)
+        
+        lifespans = lifespan_s * np.random.uniform(0.5, 1.5, num_particles)
+        # Vary particle sizes more for a splashy look
+        radii = np.maximum(1, effective_scaled_max_radius * np.random.uniform(0.3, 1.0, num_particles))
+
+        start = self.particle_count
+        stop = start + num_particles
+        if stop > self.particle_capacity:
+            self._allocate_particles(max(self.particle_capacity * 2, stop))
+        self.positions[start:stop] = (position[0], position[1])
+        self.velocities[start:stop, 0] = np.cos(angles) * speeds
+        self.velocities[start:stop, 1] = np.sin(angles) * speeds
+        self.lifespans[start:stop] = lifespans
+        self.max_lifespans[start:stop] = lifespans
+        self.radii[start:stop] = radii
+        self.max_radii[start:stop] = radii # Initial radius is max_radius
+        self.start_colors[start:stop] = enhanced_base_color
+        self.end_colors[start:stop] = actual_fade_color
+        self.colors[start:stop] = enhanced_base_color
+        self.bounces_remaining[start:stop] = self.default_particle_bounces
+        self.particle_count = stop
 
     def emit_shockwave(self, position, max_radius=100, lifespan=0.8, color=(255, 0, 0), thickness=4):
         """Emit a shockwave effect at the given position"""
@@ -326,23 +342,104 @@ class ParticleEmitter:
         self.laser_grids.append(laser_grid)
 
     def update(self, dt, arena_rect: pygame.Rect):
-        self.particles = [p for p in self.particles if p.lifespan > 0]
-        for particle in self.particles:
-            particle.update(dt, arena_rect, self.gravity, self.drag) # Pass through physics params
-        
-        # Update shockwaves
-        self.shockwaves = [s for s in self.shockwaves if s.lifespan > 0]
-        for shockwave in self.shockwaves:
-            shockwave.update(dt)
+        if not self.particle_count and not self.shockwaves and not self.laser_grids:
+            return
+
+        # Drop particles that died last frame by packing the live rows to the front
+        n = self.particle_count
+        alive = self.lifespans[:n] > 0
+        if not alive.all():
+            keep = np.flatnonzero(alive)
+            n = len(keep)
+            for array in (self.positions, self.velocities, self.lifespans, self.max_lifespans,
+                          self.radii, self.max_radii, self.start_colors, self.end_colors,
+                          self.colors, self.bounces_remaining):
+                array[:n] = array[keep]
+            self.particle_count = n
+        if n:
+            self._update_particles(dt, arena_rect, n)
         
-        # Update laser grids
-        self.laser_grids = [lg for lg in self.laser_grids if lg.lifespan > 0]
-        for laser_grid in self.laser_grids:
-            laser_grid.update(dt)
+        # Update shockwaves and laser grids
+        update_live_effects(self.shockwaves, dt)
+        update_live_effects(self.laser_grids, dt)
+
+    def _update_particles(self, dt, arena_rect, n):
+        """Step the first n particles: physics, shrink, color fade and wall bounces"""
+        positions = self.positions[:n]
+        velocities = self.velocities[:n]
+        lifespans = self.lifespans[:n]
+        radii = self.radii[:n]
+        bounces = self.bounces_remaining[:n]
+
+        # Apply physics
+        velocities[:, 0] += self.gravity.x * dt
+        velocities[:, 1] += self.gravity.y * dt
+        velocities *= self.drag ** dt
+        positions += velocities * dt
+
+        lifespans -= dt
+
+        life_ratio = np.maximum(lifespans / self.max_lifespans[:n], 0)
+        np.multiply(self.max_radii[:n], life_ratio, out=radii) # Radius shrinks
+        # Radius only shrinks and draw() skips anything under 1px, so those particles are done:
+        # ending them now lets the next update() drop them instead of simulating invisible dots
+        lifespans[radii < 1] = 0
+
+        # The fade is quantized to PARTICLE_FADE_STEPS levels: a continuous fade gives almost every particle
+        # a new color each frame, so draw() would keep missing particle_stamp's cache and re-rendering stamps.
+        # fade is in [0, 1], so the lerp of two 0-255 colors needs no clamp; uint8 assignment truncates like int()
+        fade = np.ceil(life_ratio * PARTICLE_FADE_STEPS) / PARTICLE_FADE_STEPS
+        colors = self.start_colors[:n] * fade[:, None]
+        colors += self.end_colors[:n] * (1 - fade)[:, None]
+        self.colors[:n] = colors
+
+        # Wall bouncing, for particles that still have bounces left and a visible radius.
+        # Branchless: one hit mask per axis, then clamp / flip / count with masked array ops.
+        can_bounce = (bounces > 0) & (radii > 0)
+        xs, ys = positions[:, 0], positions[:, 1]
+        min_xs = arena_rect.left + radii
+        max_xs = arena_rect.right - radii
+        min_ys = arena_rect.top + radii
+        max_ys = arena_rect.bottom - radii
+        hit_x = can_bounce & ((xs - radii < arena_rect.left) | (xs + radii > arena_rect.right))
+        hit_y = can_bounce & ((ys - radii < arena_rect.top) | (ys + radii > arena_rect.bottom))
+
+        # min then max, so the left/top wall wins if a particle is wider than the arena
+        np.copyto(xs, np.maximum(np.minimum(xs, max_xs), min_xs), where=hit_x)
+        np.copyto(ys, np.maximum(np.minimum(ys, max_ys), min_ys), where=hit_y)
+        velocities[:, 0] *= np.where(hit_x, PARTICLE_WALL_RESTITUTION, 1.0)
+        velocities[:, 1] *= np.where(hit_y, PARTICLE_WALL_RESTITUTION, 1.0)
+
+        bounced = hit_x | hit_y
+        bounces -= bounced
+        # Die very quickly after last bounce
+        np.copyto(lifespans, np.minimum(lifespans, 0.05), where=bounced & (bounces == 0))
 
     def draw(self, surface, total_arena_offset_on_screen: pygame.math.Vector2):
-        for particle in self.particles:
-            particle.draw(surface, total_arena_offset_on_screen)
+        n = self.particle_count
+        if n:
+            radii = self.radii[:n]
+            # Stamp corners for every row; a particle is drawn if it is alive, at least 1px and its
+            # stamp overlaps the surface's clip rect (blits would clip the rest away anyway)
+            int_radii = np.maximum(radii.astype(np.int64), 1)
+            centers = self.positions[:n] + (total_arena_offset_on_screen.x, total_arena_offset_on_screen.y)
+            corners = centers.astype(np.int64) - int_radii[:, None]
+            sizes = 2 * int_radii + 1
+            clip = surface.get_clip()
+            visible = ((self.lifespans[:n] > 0) & (radii >= 1)
+                       & (corners[:, 0] < clip.right) & (corners[:, 0] + sizes > clip.left)
+                       & (corners[:, 1] < clip.bottom) & (corners[:, 1] + sizes > clip.top))
+            idxs = np.flatnonzero(visible)
+            if len(idxs):
+                # One batched blit call for every particle, each a cached stamp of its radius and color
+                stamps = [(particle_stamp(radius, tuple(color)), corner)
+                          for corner, radius, color in zip(corners[idxs].tolist(),
+                                                           int_radii[idxs].tolist(),
+                                                           self.colors[idxs].tolist())]
+                if HAS_FBLITS:
+                    surface.fblits(stamps)
+                else:
+                    surface.blits(stamps, doreturn=False)
         
         # Draw shockwaves
         for shockwave in self.shockwaves:
@@ -1,9 +1,23 @@
 # engine/game_objects.py
 from dataclasses import dataclass, field
-import random, pygame, pymunk, math, time
+import random, pygame, pymunk, math, time, functools
 
 MAX_ORB_VELOCITY = 500 # pixels/second, reduced for better control and slower gameplay
 HP_ANIMATION_DURATION = 0.3 # seconds for the HP change animation
+PICKUP_POOL_MAX = 32 # released Pickups kept around for reuse by later spawns
+SAW_ROTATION_STEP_DEG = 5 # saw sprite angle is quantized to this many degrees
+_SAW_ROTATION_CACHE_MAX = 8 # saw sizes follow orb radius, so only a handful show up per match
+_saw_rotation_cache = {} # (source image, scale_px) -> [scaled sprite, rotated frames...]
+_CIRCLE_LAYER_CACHE_MAX = 32 # two shielded orbs use ~15 layers; radii passed during a size animation just cycle out
+
+@functools.lru_cache(maxsize=_CIRCLE_LAYER_CACHE_MAX)
+def circle_layer(surface_radius, color, circle_radius=None, width=0):
+    """SRCALPHA square of side 2*surface_radius with an RGBA circle drawn at its centre, built once per look"""
+    surface = pygame.Surface((surface_radius * 2, surface_radius * 2), pygame.SRCALPHA)
+    pygame.draw.circle(surface, color, (surface_radius, surface_radius),
+                       surface_radius if circle_radius is None else circle_radius, width=width)
+    return surface
+
 
 @dataclass
 class Orb:
@@ -110,16 +124,18 @@ class Orb:
 
         # Velocity capping with blade speed reduction
         if self.body: 
-            velocity = self.body.velocity
-            speed = velocity.length
+            vx, vy = self.body.velocity
+            speed_sq = vx * vx + vy * vy
             
             # Apply blade speed reduction if orb has a saw equipped
             max_velocity = MAX_ORB_VELOCITY
             if self.has_saw:
                 max_velocity = MAX_ORB_VELOCITY * 2  # 50% slower when blade equipped
             
-            if speed > max_velocity:
-                self.body.velocity = velocity.normalized() * max_velocity
+            # Squared compare skips the sqrt on the usual under-cap frame; the cap writes a plain tuple
+            if speed_sq > max_velocity * max_velocity:
+                speed = math.sqrt(speed_sq)
+                self.body.velocity = (vx / speed * max_velocity, vy / speed * max_velocity)
         
         # Update previous_hp at the end of the update, before next frame's input processing
         # This is crucial for renderer to correctly diff current vs previous visual state
@@ -142,8 +158,7 @@ class Orb:
         
         # Draw glow layers
         for glow_radius, glow_color in glow_layers:
-            glow_surface = pygame.Surface((glow_radius * 2, glow_radius * 2), pygame.SRCALPHA)
-            pygame.draw.circle(glow_surface, glow_color, (glow_radius, glow_radius), glow_radius)
+            glow_surface = circle_layer(glow_radius, glow_color)
             screen.blit(glow_surface, (int(x - glow_radius), int(y - glow_radius)))
 
         # Draw shield with enhanced neon effect if active
@@ -158,8 +173,7 @@ class Orb:
             ]
             
             for shield_radius, shield_color in shield_glow_layers:
-                shield_surface = pygame.Surface((shield_radius * 2, shield_radius * 2), pygame.SRCALPHA)
-                pygame.draw.circle(shield_surface, shield_color, (shield_radius, shield_radius), shield_radius)
+                shield_surface = circle_layer(shield_radius, shield_color)
                 screen.blit(shield_surface, (int(x - shield_radius), int(y - shield_radius)))
             
             # Shield border with pulsing effect
@@ -177,20 +191,17 @@ class Orb:
         ]
         
         for out_radius, out_color in outline_layers:
-            # Create surface for alpha blending
-            outline_surface = pygame.Surface((out_radius * 2, out_radius * 2), pygame.SRCALPHA)
-            pygame.draw.circle(outline_surface, out_color, (out_radius, out_radius), out_radius, width=6)
+            # Cached ring surface for alpha blending
+            outline_surface = circle_layer(out_radius, out_color, width=6)
             screen.blit(outline_surface, (int(x - out_radius), int(y - out_radius)))
 
         # Add inner shadow/depth to the orb
-        inner_shadow_surface = pygame.Surface((base_radius * 2, base_radius * 2), pygame.SRCALPHA)
-        pygame.draw.circle(inner_shadow_surface, (0, 0, 0, 30), (base_radius, base_radius), base_radius - 5)
+        inner_shadow_surface = circle_layer(base_radius, (0, 0, 0, 30), base_radius - 5)
         screen.blit(inner_shadow_surface, (int(x - base_radius), int(y - base_radius)))
 
         # Draw logo with subtle glow
-        logo_glow_surface = pygame.Surface((base_radius * 2, base_radius * 2), pygame.SRCALPHA)
         # Add a subtle white glow behind the logo
-        pygame.draw.circle(logo_glow_surface, (255, 255, 255, 40), (base_radius, base_radius), base_radius - 10)
+        logo_glow_surface = circle_layer(base_radius, (255, 255, 255, 40), base_radius - 10)
         screen.blit(logo_glow_surface, (int(x - base_radius), int(y - base_radius)))
         
         # Draw scaled logo on top of everything
@@ -323,10 +334,13 @@ class Pickup:
     kind: 'saw', 'heart', 'shield', 'bomb'
     """
 
+    _pool = []  # destroyed Pickups handed back via release(), reused by spawn()
+
     def __init__(self, kind, img_surface, pos, space, radius=20):
         self.kind = kind
         sprite_diameter = int(radius * 2)
         self.sprite = pygame.transform.smoothscale(img_surface, (sprite_diameter, sprite_diameter))
+        self._sprite_key = (img_surface, sprite_diameter)
         
         body = pymunk.Body(body_type=pymunk.Body.KINEMATIC)
         body.position = pos
@@ -339,6 +353,31 @@ class Pickup:
         
         self.is_active = True
 
+    @classmethod
+    def spawn(cls, kind, img_surface, pos, space, radius=20):
+        """Pickup(...) that reuses a released pickup's body, shape and sprite when one is pooled"""
+        if not cls._pool:
+            return cls(kind, img_surface, pos, space, radius=radius)
+        pickup = cls._pool.pop()
+        pickup.kind = kind
+        sprite_diameter = int(radius * 2)
+        sprite_key = (img_surface, sprite_diameter)
+        if pickup._sprite_key != sprite_key:
+            pickup.sprite = pygame.transform.smoothscale(img_surface, (sprite_diameter, sprite_diameter))
+            pickup._sprite_key = sprite_key
+        if pickup.shape.radius != radius:
+            pickup.shape.unsafe_set_radius(radius)
+        pickup.body.position = pos
+        space.add(pickup.body, pickup.shape)
+        pickup.alive = True
+        pickup.is_active = True
+        return pickup
+
+    def release(self):
+        """Return a destroyed pickup to the pool; call only once it is out of the pickups list"""
+        if not self.alive and len(Pickup._pool) < PICKUP_POOL_MAX:
+            Pickup._pool.append(self)
+
     def draw(self, screen, offset=(0, 0)):
         if not self.alive:
             return
@@ -384,13 +423,25 @@ class Pickup:
 
     def destroy(self, space):
         self.alive = False
-        if self.body in space.bodies:
+        # body.space/shape.space are O(1); `in space.bodies` copies and scans the whole list
+        if self.body is not None and self.body.space is space:
             space.remove(self.body)
-        if self.shape in space.shapes:
+        if self.shape is not None and self.shape.space is space:
             space.remove(self.shape)
-        # Make sure references are cleared to help GC if necessary, though Python handles most.
-        self.body = None
-        self.shape = None
+        # body/shape are kept so release() can pool them for the next spawn
+
+def _get_saw_rotations(img_surface, scale_px):
+    """Return the shared rotation table for a saw image at this size; frames are rotated on first use"""
+    key = (img_surface, scale_px)
+    rotations = _saw_rotation_cache.get(key)
+    if rotations is None:
+        if len(_saw_rotation_cache) >= _SAW_ROTATION_CACHE_MAX:
+            _saw_rotation_cache.clear()
+        rotations = [None] * (360 // SAW_ROTATION_STEP_DEG)
+        rotations[0] = pygame.transform.smoothscale(img_surface, (scale_px, scale_px))
+        _saw_rotation_cache[key] = rotations
+    return rotations
+
 
 class Saw:
     """
@@ -409,8 +460,8 @@ class Saw:
         orb_radius = self.owner.shape.radius 
         scale_px = int(orb_radius * 2.5) 
 
-        self.sprite_orig = pygame.transform.smoothscale(img_surface,
-                                                        (scale_px, scale_px))
+        self._rotations = _get_saw_rotations(img_surface, scale_px)
+        self.sprite_orig = self._rotations[0]
         self.sprite = self.sprite_orig
 
         r = scale_px // 2
@@ -435,7 +486,12 @@ class Saw:
         self.body.position = self.owner.body.position
         # Since saw is now a sensor, we can safely match velocity for accurate collision detection
         self.body.velocity = self.owner.body.velocity
-        self.sprite = pygame.transform.rotate(self.sprite_orig, -self.angle)
+        bucket = int(self.angle % 360) // SAW_ROTATION_STEP_DEG
+        sprite = self._rotations[bucket]
+        if sprite is None:
+            sprite = pygame.transform.rotate(self.sprite_orig, -bucket * SAW_ROTATION_STEP_DEG)
+            self._rotations[bucket] = sprite
+        self.sprite = sprite
 
     def draw(self, screen, offset=(0, 0)):
         if not self.alive or not self.owner or self.owner.hp <= 0:
@@ -475,9 +531,9 @@ class Saw:
         if not self.alive: return # Already destroyed
         self.alive = False
         print(f"DEBUG: Destroying saw for owner {self.owner.name if self.owner else 'Unknown'}.")
-        if self.body and self.body in self.space.bodies:
+        if self.body and self.body.space is self.space:
             self.space.remove(self.body)
-        if self.shape and self.shape in self.space.shapes:
+        if self.shape and self.shape.space is self.space:
             self.space.remove(self.shape)
         
         if self.owner and self.owner.has_saw == self:
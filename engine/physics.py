@@ -64,6 +64,7 @@ def make_space(arena_size=(800, 800), border_thickness=6):
         s.friction = 0.5 # Some friction
         s.collision_type = WALL_COLLISION_TYPE # Assign specific type to walls
         space.add(s)
+    space.wall_segments = static_segments # Top, right, bottom, left; lets callers move walls without scanning shapes
 
     return space
 
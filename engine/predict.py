@@ -0,0 +1,115 @@
+# engine/predict.py
+import numpy as np
+import pymunk
+from engine.physics import WALL_COLLISION_TYPE
+
+_space_cache = {}  # (arena_w, arena_h, border_thickness, damping) -> (walled space, [(body, shape), ...])
+_SPACE_CACHE_MAX = 8  # callers pass the fixed configured arena size, so in practice there is one space per damping value
+
+
+def _get_prediction_space(arena_w, arena_h, border_thickness, damping):
+    """Return a walled prediction space and its orb body pool, built once per arena size and damping"""
+    key = (arena_w, arena_h, border_thickness, damping)
+    entry = _space_cache.get(key)
+    if entry is None:
+        if len(_space_cache) >= _SPACE_CACHE_MAX:
+            _space_cache.clear()
+        temp_space = pymunk.Space()
+        temp_space.damping = damping
+
+        # Arena boundaries, matching engine/physics.py:make_space.
+        # The segments' own radius makes them thick; their centerlines sit half a border outside
+        # the arena so that the *inner edges* of the walls are at y=0, y=arena_h, x=0, x=arena_w.
+        border_segment_radius = border_thickness / 2.0
+        static_body = temp_space.static_body
+        wall_segments_params = [
+            # Top wall
+            ((-border_segment_radius, -border_segment_radius), (arena_w + border_segment_radius, -border_segment_radius)),
+            # Right wall
+            ((arena_w + border_segment_radius, -border_segment_radius), (arena_w + border_segment_radius, arena_h + border_segment_radius)),
+            # Bottom wall
+            ((arena_w + border_segment_radius, arena_h + border_segment_radius), (-border_segment_radius, arena_h + border_segment_radius)),
+            # Left wall
+            ((-border_segment_radius, arena_h + border_segment_radius), (-border_segment_radius, -border_segment_radius)),
+        ]
+        for p1, p2 in wall_segments_params:
+            segment = pymunk.Segment(static_body, p1, p2, border_segment_radius)
+            segment.elasticity = 1.0  # Standard wall elasticity
+            segment.friction = 0.5    # Standard wall friction
+            segment.collision_type = WALL_COLLISION_TYPE # Match main game wall collision type
+            temp_space.add(segment)
+        entry = (temp_space, [])
+        _space_cache[key] = entry
+    return entry
+
+
+def predict_orb_future_path_point(target_idx, positions, velocities, radii, active,
+                                  arena_w, arena_h, border_thickness, damping,
+                                  max_velocity, physics_substeps,
+                                  duration_to_predict, num_steps):
+    """
+    Simulates the target orb's movement in a temporary space to predict future position.
+    target_idx: int (row of the target orb, i.e. orb.index)
+    positions, velocities: (N, 2) float arrays; radii: (N,) float array, one row per orb
+    active: (N,) bool array of orbs that take part in the simulation, or None for all of them.
+            The target always takes part.
+    arena_w, arena_h: inner dimensions of the playable area
+    border_thickness: thickness of the walls
+    damping, max_velocity, physics_substeps: same values as the main game space
+    duration_to_predict: float (total time in seconds)
+    num_steps: int (how many steps to divide the duration into for simulation - each step is one game frame)
+    Returns: predicted Vec2d position of the target orb.
+    """
+    temp_space, pool = _get_prediction_space(arena_w, arena_h, border_thickness, damping)
+
+    # num_steps is int(prediction_duration * GAME_FPS), so each step simulates one game frame
+    dt_per_simulation_step = duration_to_predict / num_steps
+
+    # Add orbs to temp_space: target first, then the other active orbs in index order.
+    # Bodies/shapes from earlier calls are reused when the radius matches.
+    bodies = []
+    other_indices = [i for i in range(len(radii))
+                     if i != target_idx and (active is None or active[i])]
+    for slot, i in enumerate([target_idx] + other_indices):
+        radius = float(radii[i])
+        if slot < len(pool) and pool[slot][1].radius == radius:
+            body, shape = pool[slot]
+        else:
+            body = pymunk.Body(mass=1, moment=float('inf'))
+            shape = pymunk.Circle(body, radius)
+            shape.elasticity = 1.0 # TODO: Get from actual orb config or a shared constant
+            shape.friction = 0.1   # TODO: Get from actual orb config or a shared constant
+            shape.collision_type = 1 # Orb collision type (assuming 1 for orbs)
+            if slot < len(pool):
+                pool[slot] = (body, shape)
+            else:
+                pool.append((body, shape))
+        body.position = (float(positions[i, 0]), float(positions[i, 1]))
+        body.velocity = (float(velocities[i, 0]), float(velocities[i, 1]))
+        temp_space.add(body, shape)
+        bodies.append(body) # Kept for velocity capping
+    target_body = bodies[0]
+
+    sub_dt = dt_per_simulation_step / physics_substeps
+    step = temp_space.step
+    max_velocity_sq = max_velocity * max_velocity
+    for _ in range(num_steps): # Each step is one "game frame"
+        # Apply velocity cap before stepping physics for this frame:
+        # gather all velocities, scale the over-speed rows at once and write back only those
+        vs = np.array([b.velocity for b in bodies])  # Vec2d is a tuple, no copy needed
+        speeds_sq = (vs * vs).sum(axis=1)
+        over = speeds_sq > max_velocity_sq
+        if over.any():
+            vs[over] *= (max_velocity / np.sqrt(speeds_sq[over]))[:, None]
+            for i in np.flatnonzero(over):
+                bodies[i].velocity = (float(vs[i, 0]), float(vs[i, 1]))
+
+        # Perform physics sub-steps for this "game frame"
+        for _ in range(physics_substeps):
+            step(sub_dt)
+
+    # Leave only the walls in the cached space so the next call starts without stale contacts
+    for body in bodies:
+        temp_space.remove(body, *body.shapes)
+
+    return target_body.position
@@ -25,6 +25,17 @@ HP_NAME_FONT_SIZE = 64          # Even larger font for orb names
 HP_NAME_BOTTOM_MARGIN = 12      # More space between name and HP bar
 HP_SEGMENT_SHAKE_INTENSITY = 6  # Increased shake for more drama
 
+_hp_name_font_cache = {"font": None}
+
+def get_hp_name_font():
+    """Bold pygame default font for orb names, loaded once"""
+    font = _hp_name_font_cache["font"]
+    if font is None:
+        font = pygame.font.Font(None, HP_NAME_FONT_SIZE)
+        font.set_bold(True)
+        _hp_name_font_cache["font"] = font
+    return font
+
 # renderer.py  — nouvelle fonction
 def draw_top_hp_bar(screen, orb, index, total_orbs=2):
     if not orb or orb.hp < 0: 
@@ -47,7 +58,7 @@ def draw_top_hp_bar(screen, orb, index, total_orbs=2):
         highlight_hp_color = (255, 255, 255)  # Pure white highlight for neon effect
 
     # Enhanced Orb Name Display with glow effect
-    font = pygame.font.SysFont(None, HP_NAME_FONT_SIZE, bold=True)  # Make it bold
+    font = get_hp_name_font()
     name_text_color = orb.outline_color if orb.outline_color else COLOR_TEXT
     
     # Create multiple name surfaces for glow effect
@@ -253,37 +264,76 @@ def draw_top_hp_bar(screen, orb, index, total_orbs=2):
                            border_radius=inner_border_radius)
             screen.blit(shadow_surface, inner_fill_rect_base)
 
+# Last rendered HP bar band (top of the screen, background included) and what it was drawn from
+_hp_band_cache = {"key": None, "surface": None}
+
+def draw_top_hp_bars(screen, orbs, background_key):
+    """
+    Draw every orb's HP bar. While no bar is animating, the whole band is reused from the
+    previous frame as long as the HP state and the background under it (background_key) match.
+    """
+    if any(orb.hp_animation_timer > 0 for orb in orbs):
+        # Animated bars shake randomly, draw them directly
+        for i, orb in enumerate(orbs):
+            draw_top_hp_bar(screen, orb, index=i, total_orbs=len(orbs))
+        return
+
+    key = (background_key, screen.get_width(),
+           tuple((orb.name, orb.outline_color, orb.hp, orb.hp_target_for_animation, orb.max_hp) for orb in orbs))
+    if key != _hp_band_cache["key"]:
+        # Band covering all names and bars, plus a few pixels for the glow
+        name_height = get_hp_name_font().get_height()
+        band_height = (HP_BAR_PADDING_VERTICAL_TOP + 8 +
+                       len(orbs) * (name_height + HP_NAME_BOTTOM_MARGIN + HP_BAR_HEIGHT_PER_ORB + HP_BAR_SPACING_BETWEEN))
+        band_height = min(band_height, screen.get_height())
+        # Start from what is already on screen so alpha layers blend exactly as they would there
+        band = screen.subsurface((0, 0, screen.get_width(), band_height)).copy()
+        for i, orb in enumerate(orbs):
+            draw_top_hp_bar(band, orb, index=i, total_orbs=len(orbs))
+        _hp_band_cache["key"] = key
+        _hp_band_cache["surface"] = band
+    screen.blit(_hp_band_cache["surface"], (0, 0))
+
 def surface_to_array(surf):
     '''Pygame Surface -> RGB numpy array (H, W, 3)'''
     return pygame.surfarray.array3d(surf).swapaxes(0,1)
 
 import random
 
+SHAKE_TABLE_SIZE = 4096
+
 class Camera:
     def __init__(self):
         self.offset = pygame.math.Vector2(0, 0)
         self.shake_timer = 0.0
         self.shake_intensity = 0
         self.base_offset = pygame.math.Vector2(0,0) # For future use like following a player
+        # Precomputed uniform [0, 1) pairs for shake, cycled through instead of calling random per frame.
+        # Drawn from NumPy's global RNG, which export mode seeds, so exports stay reproducible.
+        self._shake_table = np.random.random((SHAKE_TABLE_SIZE, 2)).tolist()
+        self._shake_idx = 0
 
     def shake(self, intensity=5, duration=0.2):
         self.shake_intensity = intensity
         self.shake_timer = duration
 
     def update(self, dt):
-        if self.shake_timer > 0:
-            self.shake_timer -= dt
-            if self.shake_timer <= 0:
-                self.offset.x = 0
-                self.offset.y = 0
-                self.shake_intensity = 0
-            else:
-                # Simple random shake. Could be made smoother (e.g., Perlin noise, decay)
-                self.offset.x = random.randint(-self.shake_intensity, self.shake_intensity)
-                self.offset.y = random.randint(-self.shake_intensity, self.shake_intensity)
-        else:
+        # Not shaking: offset was already zeroed when the last shake ended
+        if self.shake_timer <= 0:
+            return self.offset
+        self.shake_timer -= dt
+        if self.shake_timer <= 0:
             self.offset.x = 0
             self.offset.y = 0
+            self.shake_intensity = 0
+        else:
+            # Simple random shake: uniform integer offsets in [-intensity, intensity] from the table.
+            # Could be made smoother (e.g., Perlin noise, decay)
+            ux, uy = self._shake_table[self._shake_idx]
+            self._shake_idx = (self._shake_idx + 1) % SHAKE_TABLE_SIZE
+            span = 2 * self.shake_intensity + 1
+            self.offset.x = int(ux * span) - self.shake_intensity
+            self.offset.y = int(uy * span) - self.shake_intensity
         
         # Combine with base offset if you implement camera following
         # current_display_offset = self.base_offset + self.offset 